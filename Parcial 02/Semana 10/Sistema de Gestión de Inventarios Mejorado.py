@@ -46,88 +46,179 @@ class Producto:
 # -------------------------------
 class Inventario:
     ARCHIVO = os.path.join(os.path.dirname(__file__), "inventario.json")
+    # Diario de operaciones (una línea JSON por alta/baja/actualización)
+    DIARIO = os.path.join(os.path.dirname(__file__), "inventario.journal")
+    # Cantidad de operaciones en el diario antes de compactar en el JSON
+    UMBRAL_COMPACTACION = 1000
 
     def __init__(self):
-        self.productos = []
+        # Índice principal por ID (el dict conserva el orden de inserción)
+        self.productos = {}
+        self._operaciones_diario = 0
         self.cargar_desde_archivo()
 
-    # Guardar archivo JSON
+    # Guardar archivo JSON (instantánea completa) y vaciar el diario
     def guardar_en_archivo(self):
+        temporal = self.ARCHIVO + ".tmp"
         try:
-            with open(self.ARCHIVO, "w", encoding="utf-8") as f:
-                json.dump([p.to_dict() for p in self.productos], f, indent=4, ensure_ascii=False)
+            # Se escribe en un temporal y se reemplaza: un corte nunca deja el JSON a medias
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump([p.to_dict() for p in self.productos.values()], f, indent=4, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporal, self.ARCHIVO)
+            # La instantánea ya contiene todas las operaciones: recién ahora se reinicia el diario
+            open(self.DIARIO, "w", encoding="utf-8").close()
+            self._operaciones_diario = 0
             print("Inventario guardado correctamente en archivo.")
         except PermissionError:
             print("Error: No tienes permisos para escribir en el archivo.")
         except Exception as e:
             print(f"Error inesperado al guardar el archivo: {e}")
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+
+    # Añadir una operación al diario (O(1) en disco) y compactar si se supera el umbral
+    def registrar_operacion(self, operacion):
+        try:
+            with open(self.DIARIO, "a", encoding="utf-8") as f:
+                f.write(json.dumps(operacion, ensure_ascii=False) + "\n")
+            self._operaciones_diario += 1
+        except PermissionError:
+            print("Error: No tienes permisos para escribir en el diario.")
+            return
+        except Exception as e:
+            print(f"Error inesperado al escribir el diario: {e}")
+            return
+        if self._operaciones_diario >= self.UMBRAL_COMPACTACION:
+            self.compactar()
+
+    # Compactar: volcar el estado actual al JSON y vaciar el diario
+    def compactar(self):
+        self.guardar_en_archivo()
+
+    # Aplicar una operación del diario sobre la lista en memoria
+    def _aplicar_operacion(self, operacion):
+        tipo = operacion["op"]
+        if tipo == "agregar":
+            producto = Producto.from_dict(operacion["producto"])
+            self.productos[producto.get_id()] = producto
+        elif tipo == "eliminar":
+            self.productos.pop(operacion["id"], None)
+        elif tipo == "actualizar":
+            p = self.productos.get(operacion["id"])
+            if p is not None:
+                if operacion.get("cantidad") is not None:
+                    p.set_cantidad(int(operacion["cantidad"]))
+                if operacion.get("precio") is not None:
+                    p.set_precio(float(operacion["precio"]))
+
+    # Reproducir el diario sobre la instantánea cargada
+    def reproducir_diario(self):
+        if not os.path.exists(self.DIARIO):
+            return
+        try:
+            with open(self.DIARIO, "r", encoding="utf-8") as f:
+                for linea in f:
+                    linea = linea.strip()
+                    if not linea:
+                        continue
+                    try:
+                        operacion = json.loads(linea)
+                    except json.JSONDecodeError:
+                        # Última línea incompleta (corte durante la escritura): se ignora
+                        print("Advertencia: Se ignoró una operación incompleta del diario.")
+                        continue
+                    self._aplicar_operacion(operacion)
+                    self._operaciones_diario += 1
+        except Exception as e:
+            print(f"Error inesperado al leer el diario: {e}")
+            return
+        if self._operaciones_diario:
+            print(f"Se reprodujeron {self._operaciones_diario} operación(es) del diario.")
+        if self._operaciones_diario >= self.UMBRAL_COMPACTACION:
+            self.compactar()
 
     # Cargar desde archivo JSON
     def cargar_desde_archivo(self):
         if not os.path.exists(self.ARCHIVO):
             print("No se encontró archivo de inventario. Se creará uno nuevo con productos de ejemplo.")
-            self.productos = [
+            ejemplos = [
                 Producto("P001", "Pera", 50, 0.5),
                 Producto("P002", "Uvas", 100, 2.0),
                 Producto("P003", "Leche", 30, 1.0),
                 Producto("P004", "Pan", 40, 0.8),
                 Producto("P005", "Arroz", 60, 0.6),
             ]
+            self.productos = {p.get_id(): p for p in ejemplos}
             self.guardar_en_archivo()
             return
 
         try:
             with open(self.ARCHIVO, "r", encoding="utf-8") as f:
                 data = json.load(f)
-                self.productos = [Producto.from_dict(d) for d in data]
+                self.productos = {}
+                for d in data:
+                    producto = Producto.from_dict(d)
+                    self.productos[producto.get_id()] = producto
             print("Inventario cargado correctamente desde archivo.")
         except FileNotFoundError:
             print("Error: Archivo de inventario no encontrado.")
+            return
         except json.JSONDecodeError:
-            print("Error: El archivo de inventario está corrupto. Se reiniciará vacío.")
-            self.productos = []
+            # Se aparta la instantánea dañada y se conservan las operaciones del diario
+            dañado = self.ARCHIVO + ".corrupto"
+            os.replace(self.ARCHIVO, dañado)
+            print(f"Error: El archivo de inventario está corrupto (apartado como '{dañado}'). "
+                  "Se reconstruirá solo con el diario.")
+            self.productos = {}
+            self.reproducir_diario()
             self.guardar_en_archivo()
+            return
         except Exception as e:
             print(f"Error inesperado al leer el archivo: {e}")
+            return
+        self.reproducir_diario()
 
     # Agregar producto
     def agregar_producto(self, producto):
-        if any(p.get_id() == producto.get_id() for p in self.productos):
+        if producto.get_id() in self.productos:
             print(f"Error: El ID '{producto.get_id()}' ya existe.")
             return False
-        self.productos.append(producto)
-        self.guardar_en_archivo()
+        self.productos[producto.get_id()] = producto
+        self.registrar_operacion({"op": "agregar", "producto": producto.to_dict()})
         print(f"Producto '{producto.get_nombre()}' agregado exitosamente.")
         return True
 
     # Eliminar producto
     def eliminar_producto(self, id_producto):
-        for i, p in enumerate(self.productos):
-            if p.get_id() == id_producto:
-                del self.productos[i]
-                self.guardar_en_archivo()
-                print(f"Producto con ID '{id_producto}' eliminado.")
-                return True
+        if id_producto in self.productos:
+            del self.productos[id_producto]
+            self.registrar_operacion({"op": "eliminar", "id": id_producto})
+            print(f"Producto con ID '{id_producto}' eliminado.")
+            return True
         print(f"No se encontró producto con ID '{id_producto}'.")
         return False
 
     # Actualizar producto
     def actualizar_producto(self, id_producto, cantidad=None, precio=None):
-        for p in self.productos:
-            if p.get_id() == id_producto:
-                if cantidad is not None:
-                    p.set_cantidad(cantidad)
-                if precio is not None:
-                    p.set_precio(precio)
-                self.guardar_en_archivo()
-                print(f"Producto con ID '{id_producto}' actualizado.")
-                return True
+        p = self.productos.get(id_producto)
+        if p is not None:
+            if cantidad is not None:
+                p.set_cantidad(cantidad)
+            if precio is not None:
+                p.set_precio(precio)
+            self.registrar_operacion({"op": "actualizar", "id": id_producto,
+                                      "cantidad": cantidad, "precio": precio})
+            print(f"Producto con ID '{id_producto}' actualizado.")
+            return True
         print(f"No se encontró producto con ID '{id_producto}'.")
         return False
 
     # Buscar producto por nombre
     def buscar_producto_por_nombre(self, nombre):
-        resultados = [p for p in self.productos if nombre.lower() in p.get_nombre().lower()]
+        resultados = [p for p in self.productos.values() if nombre.lower() in p.get_nombre().lower()]
         return resultados
 
     # Mostrar productos
@@ -136,7 +227,7 @@ class Inventario:
             print("El inventario está vacío.")
             return
         print("Listado completo de productos:")
-        for p in self.productos:
+        for p in self.productos.values():
             print(p)
 
 # -------------------------------
@@ -203,6 +294,7 @@ def menu():
             inventario.mostrar_todos_productos()
 
         elif opcion == "7":
+            inventario.compactar()
             print("Gracias por usar el sistema. Hasta luego.")
             break
 
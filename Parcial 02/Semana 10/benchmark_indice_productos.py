@@ -0,0 +1,92 @@
+# -------------------------------
+# Micro-benchmark del índice por ID de Inventario (Semana 9 y Semana 10)
+# -------------------------------
+# Mide el tiempo medio de agregar, actualizar y eliminar un producto con 1k,
+# 10k y 100k productos ya cargados. Si el índice es O(1) los tiempos no
+# crecen con el tamaño del inventario.
+#
+# En Semana 10 cada operación además añade una línea al diario en disco, así
+# que su costo lo domina esa escritura (abrir el archivo y añadir la línea).
+# La compactación se desactiva para medir solo la operación; su costo es el
+# de un guardado completo cada UMBRAL_COMPACTACION operaciones.
+#
+# Uso: python benchmark_indice_productos.py
+import contextlib
+import importlib.util
+import io
+import os
+import tempfile
+import time
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+TAMANOS = (1_000, 10_000, 100_000)
+REPETICIONES = 1_000  # no mayor que el tamaño más chico: cada id se toca una vez
+
+
+def cargar_modulo(nombre, ruta):
+    spec = importlib.util.spec_from_file_location(nombre, ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def medir(inv, modulo, tamano):
+    """Devuelve los microsegundos por agregar, actualizar y eliminar."""
+    # Se rellena el índice directamente para no medir la carga
+    for i in range(tamano):
+        p = modulo.Producto(f"P{i}", f"Producto {i}", i, 1.0)
+        inv.productos[p.get_id()] = p
+    nuevos = [modulo.Producto(f"N{i}", f"Nuevo {i}", 1, 1.0) for i in range(REPETICIONES)]
+    existentes = [f"P{i * (tamano // REPETICIONES)}" for i in range(REPETICIONES)]
+
+    tiempos = []
+    # Los mensajes de cada operación no se miden
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        for p in nuevos:
+            inv.agregar_producto(p)
+        tiempos.append(time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        for id_producto in existentes:
+            inv.actualizar_producto(id_producto, cantidad=5, precio=2.5)
+        tiempos.append(time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        for id_producto in existentes:
+            inv.eliminar_producto(id_producto)
+        tiempos.append(time.perf_counter() - inicio)
+    return [t / REPETICIONES * 1e6 for t in tiempos]
+
+
+def imprimir(titulo, filas):
+    print(titulo)
+    print(f"{'productos':>10} {'agregar':>10} {'actualizar':>11} {'eliminar':>10}   (µs/op)")
+    for tamano, (agregar, actualizar, eliminar) in filas:
+        print(f"{tamano:>10} {agregar:>10.2f} {actualizar:>11.2f} {eliminar:>10.2f}")
+    print()
+
+
+def main():
+    semana9 = cargar_modulo("semana9", os.path.join(CARPETA, "..", "Semana 9", "Sistema de gestion de inventario.py"))
+    semana10 = cargar_modulo("semana10", os.path.join(CARPETA, "Sistema de Gestión de Inventarios Mejorado.py"))
+
+    filas = [(tamano, medir(semana9.Inventario(), semana9, tamano)) for tamano in TAMANOS]
+    imprimir("Semana 9 (solo memoria)", filas)
+
+    filas = []
+    with tempfile.TemporaryDirectory() as carpeta:
+        # Archivos en una carpeta temporal para no tocar el inventario real
+        semana10.Inventario.ARCHIVO = os.path.join(carpeta, "inventario.json")
+        semana10.Inventario.DIARIO = os.path.join(carpeta, "inventario.journal")
+        semana10.Inventario.UMBRAL_COMPACTACION = float("inf")
+        for tamano in TAMANOS:
+            with contextlib.redirect_stdout(io.StringIO()):
+                inv = semana10.Inventario()
+            filas.append((tamano, medir(inv, semana10, tamano)))
+            os.remove(semana10.Inventario.DIARIO)
+    imprimir("Semana 10 (con diario en disco, sin compactar)", filas)
+
+
+if __name__ == "__main__":
+    main()
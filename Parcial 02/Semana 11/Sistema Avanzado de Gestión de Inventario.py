@@ -6,7 +6,7 @@ Este programa administra productos de una ferretería usando (POO).
 Funciones principales:
 ✔️ Añadir, eliminar, actualizar y buscar productos.
 ✔️ Guardar la información en un archivo JSON para persistencia.
-✔️ Exportar datos en formato CSV.
+✔️ Exportar e importar datos en formato CSV (también comprimido .csv.gz).
 ✔️ Mostrar el inventario en forma de tabla.
 ✔️ Resumen estadístico del inventario.
 ✔️ Muestra ✔️ si la operación fue exitosa y ❌ si ocurrió un error.
@@ -17,29 +17,49 @@ Fecha: 2025
 
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, List, Set, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import atexit
+import bisect
 import json
+import mmap
 import os
 import csv
+import shutil
+import struct
+import gzip
+import tempfile
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: solo lo usa MotorAnalitico
+    np = None
 
 ARCHIVO_JSON = "inventario_ferreteria.json"
+ARCHIVO_BINARIO = "inventario_ferreteria.bin"
+# Filas por lote al exportar/importar CSV (limita la memoria usada)
+TAMANO_LOTE_CSV = 5000
+# Como mucho una escritura física del JSON cada tantos segundos (0 = siempre)
+INTERVALO_GUARDADO = 2.0
+# Generaciones de respaldo del JSON (inventario_ferreteria.json.1.bak, ...)
+RESPALDOS = 1
 
 # =========================
 # MODELO DE DOMINIO
 # =========================
 @dataclass
 class Producto:
+    # Atributos en slots: sin __dict__ por instancia (menos memoria con muchos productos)
+    __slots__ = ("_id", "_nombre", "_cantidad", "_precio", "_inventario")
+
     id: str
     nombre: str
     cantidad: int
     precio: float
 
     def __post_init__(self):
-        # Validaciones
-        self.id = self.id
-        self.nombre = self.nombre
-        self.cantidad = self.cantidad
-        self.precio = self.precio
+        # Las validaciones ya las aplicaron los setters desde __init__
+        self._inventario = None
 
     @property
     def id(self) -> str:
@@ -69,7 +89,12 @@ class Producto:
     def cantidad(self, value: int) -> None:
         if int(value) < 0:
             raise ValueError("La cantidad no puede ser negativa.")
+        # Avisa al inventario que contiene el producto para mantener sus agregados
+        inventario = getattr(self, "_inventario", None)
+        anterior = self._cantidad if inventario is not None else None
         self._cantidad = int(value)
+        if inventario is not None:
+            inventario._producto_modificado(self, anterior, self._precio)
 
     @property
     def precio(self) -> float:
@@ -79,7 +104,11 @@ class Producto:
     def precio(self, value: float) -> None:
         if float(value) < 0:
             raise ValueError("El precio no puede ser negativo.")
+        inventario = getattr(self, "_inventario", None)
+        anterior = self._precio if inventario is not None else None
         self._precio = round(float(value), 2)
+        if inventario is not None:
+            inventario._producto_modificado(self, self._cantidad, anterior)
 
     def to_dict(self) -> Dict:
         return {
@@ -99,20 +128,312 @@ class Producto:
         )
 
 
+# =========================
+# MOTOR ANALÍTICO (OPCIONAL, REQUIERE NUMPY)
+# =========================
+class MotorAnalitico:
+    """Réplica columnar del inventario para estadísticas vectorizadas con NumPy.
+
+    Guarda cantidad, precio y categoría (prefijo del ID, p. ej. "CLA" en "CLA-1")
+    en arreglos contiguos. Inventario lo mantiene sincronizado al añadir,
+    eliminar o modificar productos.
+    """
+
+    def __init__(self, capacidad: int = 1024) -> None:
+        if np is None:
+            raise RuntimeError("❌ El motor analítico requiere NumPy (pip install numpy).")
+        capacidad = max(1, capacidad)
+        self._cantidad = np.zeros(capacidad, dtype=np.int64)
+        self._precio = np.zeros(capacidad, dtype=np.float64)
+        self._categoria = np.zeros(capacidad, dtype=np.int32)
+        self._ids: List[str] = []
+        self._posicion: Dict[str, int] = {}
+        self._categorias: List[str] = []
+        self._codigo_categoria: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @staticmethod
+    def categoria_de(id_producto: str) -> str:
+        return id_producto.split("-", 1)[0]
+
+    @staticmethod
+    def _ampliar(arreglo, capacidad: int):
+        nuevo = np.zeros(capacidad, dtype=arreglo.dtype)
+        nuevo[:len(arreglo)] = arreglo
+        return nuevo
+
+    def _codigo(self, id_producto: str) -> int:
+        categoria = self.categoria_de(id_producto)
+        codigo = self._codigo_categoria.get(categoria)
+        if codigo is None:
+            codigo = len(self._categorias)
+            self._categorias.append(categoria)
+            self._codigo_categoria[categoria] = codigo
+        return codigo
+
+    # ----- Sincronización -----
+    def agregar(self, p: Producto) -> None:
+        pos = len(self._ids)
+        if pos == len(self._cantidad):
+            capacidad = 2 * len(self._cantidad)
+            self._cantidad = self._ampliar(self._cantidad, capacidad)
+            self._precio = self._ampliar(self._precio, capacidad)
+            self._categoria = self._ampliar(self._categoria, capacidad)
+        self._cantidad[pos] = p.cantidad
+        self._precio[pos] = p.precio
+        self._categoria[pos] = self._codigo(p.id)
+        self._ids.append(p.id)
+        self._posicion[p.id] = pos
+
+    def quitar(self, id_producto: str) -> None:
+        # Mueve el último registro al hueco para mantener los arreglos compactos
+        pos = self._posicion.pop(id_producto)
+        ultimo = len(self._ids) - 1
+        if pos != ultimo:
+            id_ultimo = self._ids[ultimo]
+            self._cantidad[pos] = self._cantidad[ultimo]
+            self._precio[pos] = self._precio[ultimo]
+            self._categoria[pos] = self._categoria[ultimo]
+            self._ids[pos] = id_ultimo
+            self._posicion[id_ultimo] = pos
+        self._ids.pop()
+
+    def actualizar(self, p: Producto) -> None:
+        pos = self._posicion[p.id]
+        self._cantidad[pos] = p.cantidad
+        self._precio[pos] = p.precio
+
+    def limpiar(self) -> None:
+        self._ids.clear()
+        self._posicion.clear()
+
+    # ----- Consultas vectorizadas -----
+    def _columnas(self):
+        n = len(self._ids)
+        cantidad = self._cantidad[:n]
+        precio = self._precio[:n]
+        return cantidad, precio, cantidad * precio
+
+    def resumen(self) -> Dict[str, float]:
+        cantidad, precio, valor = self._columnas()
+        n = len(self._ids)
+        return {
+            "num_items": n,
+            "stock_total_unidades": int(cantidad.sum()),
+            "valor_total_inventario": round(float(valor.sum()), 2),
+            "precio_promedio": round(float(precio.mean()), 2) if n else 0.0,
+        }
+
+    def percentiles(self, campo: str = "precio",
+                    cortes: Tuple[float, ...] = (25, 50, 75, 90)) -> Dict[float, float]:
+        cantidad, precio, valor = self._columnas()
+        columnas = {"cantidad": cantidad, "precio": precio, "valor": valor}
+        if campo not in columnas:
+            raise KeyError(f"❌ Campo no válido: {campo}.")
+        if not len(self._ids):
+            return {q: 0.0 for q in cortes}
+        valores = np.percentile(columnas[campo], cortes)
+        return {q: round(float(v), 2) for q, v in zip(cortes, valores)}
+
+    def stock_bajo(self, umbral: int = 10) -> List[str]:
+        cantidad, _, _ = self._columnas()
+        return [self._ids[i] for i in np.flatnonzero(cantidad < umbral)]
+
+    def valor_por_categoria(self) -> Dict[str, float]:
+        _, _, valor = self._columnas()
+        codigos = self._categoria[:len(self._ids)]
+        minimo = len(self._categorias)
+        conteos = np.bincount(codigos, minlength=minimo)
+        totales = np.bincount(codigos, weights=valor, minlength=minimo)
+        return {
+            self._categorias[c]: round(float(totales[c]), 2)
+            for c in np.flatnonzero(conteos)
+        }
+
+
+# =========================
+# INSTANTÁNEA BINARIA (MMAP)
+# =========================
+class InstantaneaBinaria:
+    """Instantánea binaria del inventario leída bajo demanda con mmap.
+
+    Formato (little-endian): cabecera con los agregados, registros de tamaño
+    fijo ordenados por ID, índice de nombres ordenado por clave normalizada y
+    una tabla de cadenas UTF-8. Abrirla no depende del tamaño del catálogo.
+    """
+    MAGICO = b"INVF"
+    VERSION = 1
+    # magico, version, reservado, n, off_registros, n_indice, off_indice, off_cadenas,
+    # stock_total, valor_total_centavos, suma_precios_centavos
+    CABECERA = struct.Struct("<4sHHQQQQQqqq")
+    # id_off, id_len, nombre_off, nombre_len, cantidad, precio
+    REGISTRO = struct.Struct("<IIIIqd")
+    # clave_off, clave_len, registro
+    ENTRADA_NOMBRE = struct.Struct("<III")
+
+    def __init__(self, ruta: str) -> None:
+        self._archivo = open(ruta, "rb")
+        try:
+            self._mm = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+            (magico, version, _, self._n, self._off_registros, self._n_indice,
+             self._off_indice, self._off_cadenas, *agregados) = self.CABECERA.unpack_from(self._mm, 0)
+        except (ValueError, struct.error, OSError):
+            self._archivo.close()
+            raise ValueError(f"❌ {ruta} no es una instantánea de inventario válida.")
+        if magico != self.MAGICO or version != self.VERSION:
+            self.cerrar()
+            raise ValueError(f"❌ {ruta} no es una instantánea de inventario válida.")
+        self.agregados: Tuple[int, int, int] = tuple(agregados)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _cadena(self, offset: int, largo: int) -> bytes:
+        inicio = self._off_cadenas + offset
+        return self._mm[inicio:inicio + largo]
+
+    def _registro(self, i: int) -> Tuple[int, int, int, int, int, float]:
+        return self.REGISTRO.unpack_from(self._mm, self._off_registros + i * self.REGISTRO.size)
+
+    def _id_bytes(self, i: int) -> bytes:
+        id_off, id_len = self._registro(i)[:2]
+        return self._cadena(id_off, id_len)
+
+    def _clave_bytes(self, j: int) -> bytes:
+        clave_off, clave_len, _ = self.ENTRADA_NOMBRE.unpack_from(
+            self._mm, self._off_indice + j * self.ENTRADA_NOMBRE.size)
+        return self._cadena(clave_off, clave_len)
+
+    def leer_id(self, i: int) -> str:
+        return self._id_bytes(i).decode("utf-8")
+
+    def leer(self, i: int) -> Producto:
+        id_off, id_len, nom_off, nom_len, cantidad, precio = self._registro(i)
+        return Producto(
+            id=self._cadena(id_off, id_len).decode("utf-8"),
+            nombre=self._cadena(nom_off, nom_len).decode("utf-8"),
+            cantidad=cantidad,
+            precio=precio
+        )
+
+    def buscar_id(self, id_producto: str) -> Optional[int]:
+        """Posición del registro con ese ID (búsqueda binaria) o None."""
+        objetivo = id_producto.encode("utf-8")
+        lo, hi = 0, self._n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._id_bytes(mid) < objetivo:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._n and self._id_bytes(lo) == objetivo:
+            return lo
+        return None
+
+    def registros_por_nombre(self, clave: str) -> List[int]:
+        """Registros cuyo nombre normalizado es exactamente `clave`."""
+        objetivo = clave.encode("utf-8")
+        lo, hi = 0, self._n_indice
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._clave_bytes(mid) < objetivo:
+                lo = mid + 1
+            else:
+                hi = mid
+        registros: List[int] = []
+        while lo < self._n_indice and self._clave_bytes(lo) == objetivo:
+            registros.append(self.ENTRADA_NOMBRE.unpack_from(
+                self._mm, self._off_indice + lo * self.ENTRADA_NOMBRE.size)[2])
+            lo += 1
+        return registros
+
+    def cerrar(self) -> None:
+        self._mm.close()
+        self._archivo.close()
+
+    @classmethod
+    def serializar(cls, productos: Iterable[Producto], agregados: Tuple[int, int, int]) -> bytes:
+        productos = sorted(productos, key=lambda p: p.id.encode("utf-8"))
+        cadenas = bytearray()
+        registros = bytearray()
+        indice = bytearray()
+
+        def agregar_cadena(texto: str) -> Tuple[int, int]:
+            datos = texto.encode("utf-8")
+            offset = len(cadenas)
+            cadenas.extend(datos)
+            return offset, len(datos)
+
+        entradas: List[Tuple[bytes, int]] = []
+        for i, p in enumerate(productos):
+            registros += cls.REGISTRO.pack(*agregar_cadena(p.id), *agregar_cadena(p.nombre),
+                                           p.cantidad, p.precio)
+            entradas.append((Inventario._normaliza_nombre(p.nombre).encode("utf-8"), i))
+        entradas.sort()
+        for clave, i in entradas:
+            indice += cls.ENTRADA_NOMBRE.pack(*agregar_cadena(clave.decode("utf-8")), i)
+
+        off_registros = cls.CABECERA.size
+        off_indice = off_registros + len(registros)
+        off_cadenas = off_indice + len(indice)
+        cabecera = cls.CABECERA.pack(cls.MAGICO, cls.VERSION, 0, len(productos), off_registros,
+                                     len(entradas), off_indice, off_cadenas, *agregados)
+        return bytes(cabecera + registros + indice + cadenas)
+
+
 # =========================
 # INVENTARIO / REPOSITORIO
 # =========================
 class Inventario:
-    def __init__(self) -> None:
+    # Claves de ordenación admitidas por todos() y rango()
+    CLAVES_ORDEN: Dict[str, Callable[[Producto], Any]] = {
+        "id": lambda p: p.id,
+        "nombre": lambda p: p.nombre.lower(),
+        "cantidad": lambda p: p.cantidad,
+        "precio": lambda p: p.precio
+    }
+
+    def __init__(self, depurar: bool = False, intervalo_guardado: float = 0.0,
+                 respaldos: int = 0) -> None:
         self._productos: Dict[str, Producto] = {}
+        # Agrupación de escrituras: guardar() solo escribe si pasó el intervalo
+        self.intervalo_guardado = intervalo_guardado
+        self.respaldos = respaldos
+        self._ultimo_guardado = float("-inf")
+        self._ruta_pendiente: Optional[str] = None
+        # Índices ordenados (clave, id) por criterio; se construyen al primer uso
+        self._indices_orden: Dict[str, List[Tuple[Any, str]]] = {}
+        # Agregados acumulados (importes en centavos para evitar deriva de flotantes)
+        self._stock_total = 0
+        self._valor_total_centavos = 0
+        self._suma_precios_centavos = 0
+        # En modo depuración, resumen_estadistico contrasta con un recálculo completo
+        self.depurar = depurar
+        # Réplica columnar opcional (ver activar_analitica)
+        self._motor: Optional[MotorAnalitico] = None
         self._indice_nombre: Dict[str, Set[str]] = {}
+        # Índice invertido trigrama -> claves de nombre que lo contienen
+        self._indice_trigramas: Dict[str, Set[str]] = {}
+        # Instantánea binaria abierta con cargar_binario(); sus productos se crean
+        # al pedirlos y pasan a _productos (los IDs ya leídos quedan en _consumidos)
+        self._instantanea: Optional[InstantaneaBinaria] = None
+        self._consumidos: Set[str] = set()
 
     @staticmethod
     def _normaliza_nombre(nombre: str) -> str:
         return " ".join(nombre.lower().split())
 
+    @staticmethod
+    def _trigramas(texto: str) -> Set[str]:
+        return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
     def _indexar(self, p: Producto) -> None:
         clave = self._normaliza_nombre(p.nombre)
+        if clave not in self._indice_nombre:
+            for tri in self._trigramas(clave):
+                self._indice_trigramas.setdefault(tri, set()).add(clave)
         self._indice_nombre.setdefault(clave, set()).add(p.id)
 
     def _desindexar(self, p: Producto) -> None:
@@ -122,20 +443,144 @@ class Inventario:
             ids.discard(p.id)
             if not ids:
                 self._indice_nombre.pop(clave, None)
+                for tri in self._trigramas(clave):
+                    claves = self._indice_trigramas.get(tri)
+                    if claves:
+                        claves.discard(clave)
+                        if not claves:
+                            self._indice_trigramas.pop(tri, None)
+
+    @staticmethod
+    def _centavos(precio: float) -> int:
+        return round(precio * 100)
+
+    def _sumar_agregados(self, cantidad: int, precio: float, signo: int) -> None:
+        centavos = self._centavos(precio)
+        self._stock_total += signo * cantidad
+        self._valor_total_centavos += signo * cantidad * centavos
+        self._suma_precios_centavos += signo * centavos
+
+    def _producto_modificado(self, p: Producto, cantidad_anterior: int, precio_anterior: float) -> None:
+        self._sumar_agregados(cantidad_anterior, precio_anterior, -1)
+        self._sumar_agregados(p.cantidad, p.precio, 1)
+        if cantidad_anterior != p.cantidad:
+            self._reordenar("cantidad", p, cantidad_anterior)
+        if precio_anterior != p.precio:
+            self._reordenar("precio", p, precio_anterior)
+        if self._motor is not None:
+            self._motor.actualizar(p)
+
+    def _indice_orden(self, orden: str) -> List[Tuple[Any, str]]:
+        indice = self._indices_orden.get(orden)
+        if indice is None:
+            self._materializar_todo()
+            clave = self.CLAVES_ORDEN[orden]
+            indice = sorted((clave(p), p.id) for p in self._productos.values())
+            self._indices_orden[orden] = indice
+        return indice
+
+    def _insertar_en_orden(self, p: Producto) -> None:
+        for orden, indice in self._indices_orden.items():
+            bisect.insort(indice, (self.CLAVES_ORDEN[orden](p), p.id))
+
+    @staticmethod
+    def _quitar_de_orden(indice: List[Tuple[Any, str]], entrada: Tuple[Any, str]) -> None:
+        pos = bisect.bisect_left(indice, entrada)
+        if pos < len(indice) and indice[pos] == entrada:
+            del indice[pos]
+
+    def _reordenar(self, orden: str, p: Producto, valor_anterior: Any) -> None:
+        indice = self._indices_orden.get(orden)
+        if indice is not None:
+            self._quitar_de_orden(indice, (valor_anterior, p.id))
+            bisect.insort(indice, (self.CLAVES_ORDEN[orden](p), p.id))
+
+    def _registrar(self, p: Producto, ordenar: bool = True, sumar: bool = True) -> None:
+        self._productos[p.id] = p
+        self._indexar(p)
+        if ordenar:
+            self._insertar_en_orden(p)
+        if sumar:
+            self._sumar_agregados(p.cantidad, p.precio, 1)
+        if self._motor is not None:
+            self._motor.agregar(p)
+        p._inventario = self
+
+    def _registrar_lote(self, productos: List[Producto]) -> None:
+        # Con lotes grandes es más barato reconstruir los índices ordenados al usarlos
+        ordenar = len(productos) < 64
+        for p in productos:
+            self._registrar(p, ordenar=ordenar)
+        if not ordenar:
+            self._indices_orden.clear()
+
+    # ----- Instantánea binaria -----
+    def _materializar(self, id_producto: str) -> Optional[Producto]:
+        # Los agregados de la instantánea ya vienen en su cabecera: no se suman
+        if self._instantanea is None or id_producto in self._consumidos:
+            return None
+        i = self._instantanea.buscar_id(id_producto)
+        if i is None:
+            return None
+        p = self._instantanea.leer(i)
+        self._consumidos.add(p.id)
+        self._registrar(p, sumar=False)
+        return p
+
+    def _materializar_todo(self) -> None:
+        if self._instantanea is None:
+            return
+        instantanea = self._instantanea
+        for i in range(len(instantanea)):
+            if instantanea.leer_id(i) not in self._consumidos:
+                self._registrar(instantanea.leer(i), ordenar=False, sumar=False)
+        self._indices_orden.clear()
+        instantanea.cerrar()
+        self._instantanea = None
+        self._consumidos.clear()
+
+    def _existe(self, id_producto: str) -> bool:
+        if id_producto in self._productos:
+            return True
+        return (self._instantanea is not None and id_producto not in self._consumidos
+                and self._instantanea.buscar_id(id_producto) is not None)
+
+    def _num_items(self) -> int:
+        pendientes = len(self._instantanea) - len(self._consumidos) if self._instantanea else 0
+        return len(self._productos) + pendientes
+
+    def _claves_candidatas(self, patron: str) -> Set[str]:
+        """Claves que comparten todos los trigramas del patrón (patrones cortos: todas)."""
+        trigramas = self._trigramas(patron)
+        if not trigramas:
+            return set(self._indice_nombre)
+        conjuntos = []
+        for tri in trigramas:
+            claves = self._indice_trigramas.get(tri)
+            if not claves:
+                return set()
+            conjuntos.append(claves)
+        conjuntos.sort(key=len)
+        return set(conjuntos[0]).intersection(*conjuntos[1:])
 
     # ----- Operaciones -----
     def anadir_producto(self, producto: Producto) -> None:
-        if producto.id in self._productos:
+        if self._existe(producto.id):
             raise KeyError(f"❌ Ya existe un producto con ID {producto.id}.")
-        self._productos[producto.id] = producto
-        self._indexar(producto)
+        self._registrar(producto)
 
     def eliminar_producto(self, id_producto: str) -> Producto:
         id_producto = id_producto.strip().upper()
-        if id_producto not in self._productos:
+        if id_producto not in self._productos and self._materializar(id_producto) is None:
             raise KeyError(f"❌ No existe un producto con ID {id_producto}.")
         p = self._productos.pop(id_producto)
         self._desindexar(p)
+        for orden, indice in self._indices_orden.items():
+            self._quitar_de_orden(indice, (self.CLAVES_ORDEN[orden](p), p.id))
+        self._sumar_agregados(p.cantidad, p.precio, -1)
+        if self._motor is not None:
+            self._motor.quitar(p.id)
+        p._inventario = None
         return p
 
     def actualizar_cantidad(self, id_producto: str, nueva_cantidad: int) -> None:
@@ -144,9 +589,19 @@ class Inventario:
     def actualizar_precio(self, id_producto: str, nuevo_precio: float) -> None:
         self.obtener_por_id(id_producto).precio = nuevo_precio
 
+    def activar_analitica(self) -> MotorAnalitico:
+        """Crea (una vez) el motor analítico columnar y lo llena con el inventario actual."""
+        if self._motor is None:
+            self._materializar_todo()
+            motor = MotorAnalitico(capacidad=max(1024, len(self._productos)))
+            for p in self._productos.values():
+                motor.agregar(p)
+            self._motor = motor
+        return self._motor
+
     def obtener_por_id(self, id_producto: str) -> Producto:
         id_producto = id_producto.strip().upper()
-        if id_producto not in self._productos:
+        if id_producto not in self._productos and self._materializar(id_producto) is None:
             raise KeyError(f"❌ No existe un producto con ID {id_producto}.")
         return self._productos[id_producto]
 
@@ -154,13 +609,19 @@ class Inventario:
         patron = self._normaliza_nombre(patron_nombre)
         resultados: List[Producto] = []
 
+        if self._instantanea is not None:
+            for i in self._instantanea.registros_por_nombre(patron):
+                self._materializar(self._instantanea.leer_id(i))
+
         ids_exacto = self._indice_nombre.get(patron, set())
         resultados.extend(self._productos[_id] for _id in ids_exacto)
 
         if not resultados:
-            for clave, ids in self._indice_nombre.items():
+            # La búsqueda parcial necesita todos los nombres indexados en memoria
+            self._materializar_todo()
+            for clave in self._claves_candidatas(patron):
                 if patron in clave:
-                    resultados.extend(self._productos[_id] for _id in ids)
+                    resultados.extend(self._productos[_id] for _id in self._indice_nombre[clave])
 
         vistos: Set[str] = set()
         unicos: List[Producto] = []
@@ -171,46 +632,264 @@ class Inventario:
         return unicos
 
     def todos(self, orden: str = "id") -> List[Producto]:
-        key_map = {
-            "id": lambda p: p.id,
-            "nombre": lambda p: p.nombre.lower(),
-            "cantidad": lambda p: p.cantidad,
-            "precio": lambda p: p.precio
-        }
-        clave = key_map.get(orden, key_map["id"])
-        return sorted(self._productos.values(), key=clave)
+        if orden not in self.CLAVES_ORDEN:
+            orden = "id"
+        return list(self.iterar(orden))
+
+    def iterar(self, orden: str = "id") -> Iterator[Producto]:
+        if orden not in self.CLAVES_ORDEN:
+            orden = "id"
+        for _, _id in self._indice_orden(orden):
+            yield self._productos[_id]
+
+    def rango(self, orden: str, desde: Optional[Any] = None, hasta: Optional[Any] = None) -> List[Producto]:
+        """Productos con desde <= clave < hasta según el criterio `orden`."""
+        if orden not in self.CLAVES_ORDEN:
+            raise KeyError(f"❌ Criterio de orden no válido: {orden}.")
+        indice = self._indice_orden(orden)
+        inicio = bisect.bisect_left(indice, (desde,)) if desde is not None else 0
+        fin = bisect.bisect_left(indice, (hasta,)) if hasta is not None else len(indice)
+        return [self._productos[_id] for _, _id in indice[inicio:fin]]
+
+    def stock_bajo(self, umbral: int = 10) -> List[Producto]:
+        return self.rango("cantidad", hasta=umbral)
 
-    def guardar(self, ruta: str = ARCHIVO_JSON) -> None:
+    def guardar(self, ruta: str = ARCHIVO_JSON, forzar: bool = False) -> bool:
+        """Guarda el inventario; devuelve False si la escritura quedó pendiente.
+
+        Si no pasó `intervalo_guardado` desde la última escritura, solo se marca
+        como pendiente y la escribe la siguiente llamada fuera del intervalo,
+        `vaciar_pendiente()` o `guardar(forzar=True)`.
+        """
+        ahora = time.monotonic()
+        if not forzar and ahora - self._ultimo_guardado < self.intervalo_guardado:
+            self._ruta_pendiente = ruta
+            return False
+        self._materializar_todo()
         data = [p.to_dict() for p in self._productos.values()]
-        with open(ruta, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._escribir_atomico(ruta, data)
+        self._ultimo_guardado = time.monotonic()
+        self._ruta_pendiente = None
+        return True
+
+    def vaciar_pendiente(self, forzar: bool = True) -> bool:
+        """Escribe la escritura pendiente, si la hay.
+
+        Con `forzar=False` solo la escribe si ya pasó `intervalo_guardado`.
+        """
+        if self._ruta_pendiente is None:
+            return False
+        return self.guardar(self._ruta_pendiente, forzar=forzar)
+
+    def _ruta_respaldo(self, ruta: str, generacion: int) -> str:
+        return f"{ruta}.{generacion}.bak"
+
+    def _rotar_respaldos(self, ruta: str) -> None:
+        if self.respaldos <= 0 or not os.path.exists(ruta):
+            return
+        for gen in range(self.respaldos, 1, -1):
+            anterior = self._ruta_respaldo(ruta, gen - 1)
+            if os.path.exists(anterior):
+                os.replace(anterior, self._ruta_respaldo(ruta, gen))
+        primero = self._ruta_respaldo(ruta, 1)
+        if os.path.exists(primero):
+            os.remove(primero)
+        try:
+            # Enlace duro: el respaldo no copia datos y el original sigue en su sitio
+            os.link(ruta, primero)
+        except OSError:
+            shutil.copy2(ruta, primero)
+
+    @staticmethod
+    def _permisos(ruta: str) -> int:
+        # Los del archivo existente, o los de un archivo nuevo según la umask
+        try:
+            return os.stat(ruta).st_mode & 0o7777
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
+
+    def _escribir_atomico(self, ruta: str, data: Union[List[Dict], bytes]) -> None:
+        # Archivo temporal en el mismo directorio + fsync + rename: nunca queda truncado
+        directorio = os.path.dirname(os.path.abspath(ruta))
+        fd, temporal = tempfile.mkstemp(prefix=".inventario-", suffix=".tmp", dir=directorio)
+        try:
+            if isinstance(data, bytes):
+                f = os.fdopen(fd, "wb")
+            else:
+                f = os.fdopen(fd, "w", encoding="utf-8")
+            with f:
+                if isinstance(data, bytes):
+                    f.write(data)
+                else:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                # mkstemp crea el archivo con 0600: se conservan los permisos del original
+                os.chmod(temporal, self._permisos(ruta))
+                os.fsync(f.fileno())
+            self._rotar_respaldos(ruta)
+            os.replace(temporal, ruta)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+        if os.name != "nt":
+            fd_dir = os.open(directorio, os.O_RDONLY)
+            try:
+                os.fsync(fd_dir)
+            finally:
+                os.close(fd_dir)
+
+    def _leer_json(self, ruta: str) -> List[Dict]:
+        # Si el archivo principal está dañado se prueban los respaldos en orden
+        candidatos = [ruta] + [self._ruta_respaldo(ruta, g) for g in range(1, self.respaldos + 1)]
+        error: Optional[Exception] = None
+        for candidato in candidatos:
+            if not os.path.exists(candidato):
+                continue
+            try:
+                with open(candidato, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except json.JSONDecodeError as e:
+                error = e
+        if error is not None:
+            raise error
+        return []
 
     def cargar(self, ruta: str = ARCHIVO_JSON) -> None:
-        if not os.path.exists(ruta):
+        if not os.path.exists(ruta) and not os.path.exists(self._ruta_respaldo(ruta, 1)):
             return
-        with open(ruta, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = self._leer_json(ruta)
+        self._reiniciar()
+        for item in data:
+            self._registrar(Producto.from_dict(item))
+
+    def _reiniciar(self) -> None:
+        for p in self._productos.values():
+            p._inventario = None
         self._productos.clear()
         self._indice_nombre.clear()
-        for item in data:
-            p = Producto.from_dict(item)
-            self._productos[p.id] = p
-            self._indexar(p)
+        self._indice_trigramas.clear()
+        self._indices_orden.clear()
+        self._stock_total = 0
+        self._valor_total_centavos = 0
+        self._suma_precios_centavos = 0
+        if self._motor is not None:
+            self._motor.limpiar()
+        if self._instantanea is not None:
+            self._instantanea.cerrar()
+            self._instantanea = None
+        self._consumidos.clear()
+
+    def cargar_binario(self, ruta: str = ARCHIVO_BINARIO) -> None:
+        """Abre una instantánea binaria; los productos se leen al pedirlos."""
+        instantanea = InstantaneaBinaria(ruta)
+        self._reiniciar()
+        self._instantanea = instantanea
+        self._stock_total, self._valor_total_centavos, self._suma_precios_centavos = instantanea.agregados
+        if self._motor is not None:
+            # El motor analítico necesita todas las filas
+            self._materializar_todo()
+
+    def guardar_binario(self, ruta: str = ARCHIVO_BINARIO) -> None:
+        self._materializar_todo()
+        agregados = (self._stock_total, self._valor_total_centavos, self._suma_precios_centavos)
+        self._escribir_atomico(ruta, InstantaneaBinaria.serializar(self._productos.values(), agregados))
 
     @staticmethod
     def fila_producto(p: Producto) -> Tuple[str, str, int, str, str]:
         total = round(p.cantidad * p.precio, 2)
         return (p.id, p.nombre, p.cantidad, f"{p.precio:.2f}", f"{total:.2f}")
 
-    def exportar_csv(self, ruta_csv: str = "inventario_ferreteria.csv") -> None:
+    @staticmethod
+    def _abrir_csv(ruta_csv: str, modo: str):
+        # Los archivos terminados en .gz se leen/escriben comprimidos con gzip
+        if ruta_csv.endswith(".gz"):
+            return gzip.open(ruta_csv, modo + "t", encoding="utf-8", newline="")
+        return open(ruta_csv, modo, encoding="utf-8", newline="")
+
+    @staticmethod
+    def _en_lotes(filas: Iterable[Any], tamano: int = TAMANO_LOTE_CSV) -> Iterator[List[Any]]:
+        lote: List[Any] = []
+        for fila in filas:
+            lote.append(fila)
+            if len(lote) >= tamano:
+                yield lote
+                lote = []
+        if lote:
+            yield lote
+
+    def exportar_csv(self, ruta_csv: str = "inventario_ferreteria.csv") -> int:
         campos = ["ID", "Nombre", "Cantidad", "Precio", "ValorTotal"]
-        with open(ruta_csv, "w", encoding="utf-8", newline="") as f:
+        filas = 0
+        with self._abrir_csv(ruta_csv, "w") as f:
             w = csv.writer(f)
             w.writerow(campos)
-            for p in self.todos():
-                w.writerow(self.fila_producto(p))
+            for lote in self._en_lotes(self.fila_producto(p) for p in self.iterar()):
+                w.writerows(lote)
+                filas += len(lote)
+        return filas
+
+    def importar_csv(self, ruta_csv: str) -> Dict[str, Any]:
+        """Importa productos desde un CSV (o .csv.gz) con columnas ID, Nombre, Cantidad, Precio.
+
+        Las filas inválidas o con ID repetido se descartan; se devuelve un resumen
+        con importados, rechazados, errores (los primeros) y filas por segundo.
+        """
+        inicio = time.perf_counter()
+        importados = 0
+        rechazados = 0
+        errores: List[str] = []
+        with self._abrir_csv(ruta_csv, "r") as f:
+            lector = csv.DictReader(f)
+            for lote in self._en_lotes(enumerate(lector, start=2)):
+                validos: List[Producto] = []
+                ids_lote: Set[str] = set()
+                for num_linea, fila in lote:
+                    try:
+                        p = Producto(
+                            id=fila["ID"],
+                            nombre=fila["Nombre"],
+                            cantidad=int(fila["Cantidad"]),
+                            precio=float(fila["Precio"])
+                        )
+                        if self._existe(p.id) or p.id in ids_lote:
+                            raise ValueError(f"ID repetido {p.id}.")
+                    except (KeyError, TypeError, ValueError, AttributeError) as e:
+                        rechazados += 1
+                        if len(errores) < 20:
+                            errores.append(f"Línea {num_linea}: {e}")
+                        continue
+                    ids_lote.add(p.id)
+                    validos.append(p)
+                self._registrar_lote(validos)
+                importados += len(validos)
+        segundos = time.perf_counter() - inicio
+        return {
+            "importados": importados,
+            "rechazados": rechazados,
+            "errores": errores,
+            "filas_por_segundo": round((importados + rechazados) / segundos) if segundos else 0,
+        }
 
     def resumen_estadistico(self) -> Dict[str, float]:
+        num_items = self._num_items()
+        resumen = {
+            "num_items": num_items,
+            "stock_total_unidades": self._stock_total,
+            "valor_total_inventario": round(self._valor_total_centavos / 100, 2),
+            "precio_promedio": round(
+                (self._suma_precios_centavos / 100 / num_items) if num_items else 0.0,
+                2
+            ),
+        }
+        if self.depurar:
+            self._verificar_resumen(resumen)
+        return resumen
+
+    def _resumen_recalculado(self) -> Dict[str, float]:
+        self._materializar_todo()
         cantidades = [p.cantidad for p in self._productos.values()]
         valores_totales = [p.cantidad * p.precio for p in self._productos.values()]
         return {
@@ -224,6 +903,29 @@ class Inventario:
             ),
         }
 
+    def _verificar_resumen(self, resumen: Dict[str, float]) -> None:
+        esperado = self._resumen_recalculado()
+        for clave, valor in esperado.items():
+            if abs(resumen[clave] - valor) > 0.01:
+                raise RuntimeError(
+                    f"❌ Agregado '{clave}' desincronizado: {resumen[clave]} != {valor}."
+                )
+
+
+# =========================
+# CONVERSIÓN JSON <-> BINARIO
+# =========================
+def json_a_binario(ruta_json: str = ARCHIVO_JSON, ruta_binario: str = ARCHIVO_BINARIO) -> None:
+    inv = Inventario()
+    inv.cargar(ruta_json)
+    inv.guardar_binario(ruta_binario)
+
+
+def binario_a_json(ruta_binario: str = ARCHIVO_BINARIO, ruta_json: str = ARCHIVO_JSON) -> None:
+    inv = Inventario()
+    inv.cargar_binario(ruta_binario)
+    inv.guardar(ruta_json, forzar=True)
+
 
 # =========================
 # UTILIDADES DE CONSOLA
@@ -265,8 +967,10 @@ def pausar() -> None:
 # MENÚ INTERACTIVO
 # =========================
 def menu() -> None:
-    inv = Inventario()
+    inv = Inventario(intervalo_guardado=INTERVALO_GUARDADO, respaldos=RESPALDOS)
     inv.cargar(ARCHIVO_JSON)
+    # Un cambio agrupado no se pierde si se sale con Ctrl-C o se cierra la entrada
+    atexit.register(inv.vaciar_pendiente)
 
     if not inv.todos():
         semillas = [
@@ -294,10 +998,14 @@ def menu() -> None:
         ("7", "Exportar CSV"),
         ("8", "Resumen estadístico"),
         ("9", "Guardar"),
+        ("10", "Importar CSV"),
         ("0", "Salir"),
     )
 
     while True:
+        # Escribe lo que quedó pendiente en cuanto vence el intervalo, aunque
+        # después solo se hagan búsquedas o listados
+        inv.vaciar_pendiente(forzar=False)
         os.system("cls" if os.name == "nt" else "clear")
         print("=== Inventario Ferretería ===\n")
         for codigo, texto in opciones:
@@ -352,8 +1060,22 @@ def menu() -> None:
             elif eleccion == "7":
                 print("\n>> Exportar CSV")
                 ruta = input("Nombre de archivo CSV [inventario_ferreteria.csv]: ").strip() or "inventario_ferreteria.csv"
-                inv.exportar_csv(ruta)
+                inicio = time.perf_counter()
+                filas = inv.exportar_csv(ruta)
+                segundos = time.perf_counter() - inicio
                 print(f"✔️ CSV exportado en: {os.path.abspath(ruta)}")
+                print(f"✔️ {filas} filas en {segundos:.2f} s")
+
+            elif eleccion == "10":
+                print("\n>> Importar CSV")
+                ruta = input("Archivo CSV a importar (.csv o .csv.gz): ").strip()
+                resultado = inv.importar_csv(ruta)
+                for error in resultado["errores"]:
+                    print(f"❌ {error}")
+                print(f"✔️ Importados: {resultado['importados']} | Rechazados: {resultado['rechazados']}")
+                print(f"✔️ Velocidad: {resultado['filas_por_segundo']} filas/s")
+                if resultado["importados"]:
+                    inv.guardar()
 
             elif eleccion == "8":
                 print("\n>> Resumen estadístico")
@@ -364,11 +1086,11 @@ def menu() -> None:
                 print(f"✔️ Precio promedio (USD): {stats['precio_promedio']:.2f}")
 
             elif eleccion == "9":
-                inv.guardar()
+                inv.guardar(forzar=True)
                 print("✔️ Inventario guardado en JSON.")
 
             elif eleccion == "0":
-                inv.guardar()
+                inv.guardar(forzar=True)
                 print("✔️ Cambios guardados. ¡Goodbye!")
                 break
 
@@ -0,0 +1,149 @@
+# -------------------------------
+# Benchmark de memoria y construcción de Producto (con y sin __slots__)
+# -------------------------------
+# Compara el Producto actual (atributos en __slots__) con la versión anterior,
+# que guardaba _id, _nombre, _cantidad y _precio en el __dict__ de cada
+# instancia. Para cada tamaño mide:
+#   - memoria: bytes reservados por producto al crearlos (tracemalloc); incluye
+#     el ID en mayúsculas y el precio redondeado que crean los setters, iguales
+#     en las dos versiones
+#   - µs: tiempo de construcción por producto, pasando por los setters
+# Se usa tracemalloc y no sys.getsizeof(p.__dict__): desde Python 3.11 los
+# atributos viven en línea hasta que se pide el __dict__, y pedirlo lo crea.
+#
+# Uso: python benchmark_producto.py
+from dataclasses import dataclass
+from typing import Dict
+import gc
+import importlib.util
+import os
+import sys
+import time
+import tracemalloc
+
+RUTA_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Sistema Avanzado de Gestión de Inventario.py")
+TAMANOS = (10_000, 100_000, 1_000_000)
+
+
+# Producto tal como estaba antes de usar __slots__ (cada instancia con su __dict__)
+@dataclass
+class ProductoAnterior:
+    id: str
+    nombre: str
+    cantidad: int
+    precio: float
+
+    def __post_init__(self):
+        # Validaciones
+        self.id = self.id
+        self.nombre = self.nombre
+        self.cantidad = self.cantidad
+        self.precio = self.precio
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    @id.setter
+    def id(self, value: str) -> None:
+        if not value.strip():
+            raise ValueError("El ID no puede estar vacío.")
+        self._id = value.strip().upper()
+
+    @property
+    def nombre(self) -> str:
+        return self._nombre
+
+    @nombre.setter
+    def nombre(self, value: str) -> None:
+        if not value.strip():
+            raise ValueError("El nombre no puede estar vacío.")
+        self._nombre = value.strip()
+
+    @property
+    def cantidad(self) -> int:
+        return self._cantidad
+
+    @cantidad.setter
+    def cantidad(self, value: int) -> None:
+        if int(value) < 0:
+            raise ValueError("La cantidad no puede ser negativa.")
+        anterior = getattr(self, "_cantidad", None)
+        self._cantidad = int(value)
+        if anterior is not None:
+            self._notificar(anterior, self._precio)
+
+    @property
+    def precio(self) -> float:
+        return self._precio
+
+    @precio.setter
+    def precio(self, value: float) -> None:
+        if float(value) < 0:
+            raise ValueError("El precio no puede ser negativo.")
+        anterior = getattr(self, "_precio", None)
+        self._precio = round(float(value), 2)
+        if anterior is not None:
+            self._notificar(self._cantidad, anterior)
+
+    def _notificar(self, cantidad_anterior: int, precio_anterior: float) -> None:
+        inventario = getattr(self, "_inventario", None)
+        if inventario is not None:
+            inventario._producto_modificado(self, cantidad_anterior, precio_anterior)
+
+    def to_dict(self) -> Dict:
+        return {"id": self.id, "nombre": self.nombre, "cantidad": self.cantidad, "precio": self.precio}
+
+
+def cargar_app():
+    spec = importlib.util.spec_from_file_location("inventario_avanzado", RUTA_APP)
+    modulo = importlib.util.module_from_spec(spec)
+    # dataclass resuelve las anotaciones en diferido buscando el módulo en sys.modules
+    sys.modules[spec.name] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def datos(cantidad):
+    return [(f"P{i}", f"Producto {i}", i % 500, float(i % 100)) for i in range(cantidad)]
+
+
+def medir_memoria(clase, filas):
+    """Bytes por producto al construir len(filas) productos."""
+    gc.collect()
+    tracemalloc.start()
+    productos = [clase(*fila) for fila in filas]
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # La lista que los contiene no es parte del producto
+    memoria -= sys.getsizeof(productos)
+    # Verificación rápida: las dos clases dan el mismo resultado
+    assert productos[-1].to_dict()["id"] == filas[-1][0]
+    return memoria / len(filas)
+
+
+def medir_tiempo(clase, filas):
+    # Sin tracemalloc, que encarece cada reserva de memoria
+    gc.collect()
+    inicio = time.perf_counter()
+    productos = [clase(*fila) for fila in filas]
+    segundos = time.perf_counter() - inicio
+    del productos
+    return segundos / len(filas) * 1e6
+
+
+def main():
+    app = cargar_app()
+    print(f"{'productos':>10} {'B antes':>8} {'B ahora':>8} {'µs antes':>9} {'µs ahora':>9}   (B y µs por producto)")
+    for cantidad in TAMANOS:
+        filas = datos(cantidad)
+        memoria_antes = medir_memoria(ProductoAnterior, filas)
+        memoria_ahora = medir_memoria(app.Producto, filas)
+        tiempo_antes = medir_tiempo(ProductoAnterior, filas)
+        tiempo_ahora = medir_tiempo(app.Producto, filas)
+        print(f"{cantidad:>10} {memoria_antes:>8.0f} {memoria_ahora:>8.0f} "
+              f"{tiempo_antes:>9.2f} {tiempo_ahora:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
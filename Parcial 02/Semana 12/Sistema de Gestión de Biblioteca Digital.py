@@ -2,8 +2,20 @@
 # Sistema de Biblioteca General
 # =============================
 
+import bisect
+import contextlib
+import heapq
 import json
-from typing import List, Tuple, Dict, Set
+import math
+import os
+import queue
+import re
+import sqlite3
+import time
+import unicodedata
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import List, Tuple, Dict, Set, Optional, Iterator
 
 # -----------------------------
 # Clase Libro
@@ -27,149 +39,1401 @@ class Libro:
             "isbn": self.isbn
         }
 
+# -----------------------------
+# Clase IndiceLibros
+# -----------------------------
+class IndiceLibros:
+    """Índices hash por título, autor y categoría (sin mayúsculas ni tildes)."""
+
+    CAMPOS = ("titulo", "autor", "categoria")
+
+    def __init__(self):
+        self.indices: Dict[str, Dict[str, Dict[str, Libro]]] = {campo: {} for campo in self.CAMPOS}
+
+    @staticmethod
+    def normalizar(texto: str) -> str:
+        descompuesto = unicodedata.normalize("NFKD", texto.casefold())
+        sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+        return " ".join(sin_tildes.split())
+
+    @staticmethod
+    def _valores(libro: Libro) -> Tuple[str, str, str]:
+        return (libro.info[0], libro.info[1], libro.categoria)
+
+    def agregar(self, libro: Libro):
+        for campo, valor in zip(self.CAMPOS, self._valores(libro)):
+            self.indices[campo].setdefault(self.normalizar(valor), {})[libro.isbn] = libro
+
+    def quitar(self, libro: Libro):
+        for campo, valor in zip(self.CAMPOS, self._valores(libro)):
+            clave = self.normalizar(valor)
+            libros = self.indices[campo].get(clave)
+            if libros is not None:
+                libros.pop(libro.isbn, None)
+                if not libros:
+                    del self.indices[campo][clave]
+
+    def buscar(self, campo: str, texto: str) -> List[Libro]:
+        return list(self.indices[campo].get(self.normalizar(texto), {}).values())
+
+# -----------------------------
+# Clase RegistroPrestamos
+# -----------------------------
+class RegistroPrestamos:
+    """Préstamos activos indexados por (id_usuario, isbn) y por usuario.
+
+    Se recorre en orden de préstamo y se guarda con la misma forma de lista
+    de diccionarios que usa prestamos.json.
+    """
+
+    def __init__(self):
+        self._por_clave: Dict[Tuple[str, str], Dict] = {}
+        self._por_usuario: Dict[str, Set[str]] = {}
+
+    @staticmethod
+    def _clave(prestamo: Dict) -> Tuple[str, str]:
+        return (prestamo["id_usuario"], prestamo["libro"]["isbn"])
+
+    def agregar(self, prestamo: Dict):
+        id_usuario, isbn = self._clave(prestamo)
+        self._por_clave[(id_usuario, isbn)] = prestamo
+        self._por_usuario.setdefault(id_usuario, set()).add(isbn)
+
+    def quitar(self, id_usuario: str, isbn: str) -> Optional[Dict]:
+        prestamo = self._por_clave.pop((id_usuario, isbn), None)
+        if prestamo is not None:
+            isbns = self._por_usuario[id_usuario]
+            isbns.discard(isbn)
+            if not isbns:
+                del self._por_usuario[id_usuario]
+        return prestamo
+
+    def quitar_usuario(self, id_usuario: str) -> List[Dict]:
+        return [self._por_clave.pop((id_usuario, isbn)) for isbn in self._por_usuario.pop(id_usuario, set())]
+
+    def obtener(self, id_usuario: str, isbn: str) -> Optional[Dict]:
+        return self._por_clave.get((id_usuario, isbn))
+
+    def de_usuario(self, id_usuario: str) -> List[Dict]:
+        return [self._por_clave[(id_usuario, isbn)] for isbn in self._por_usuario.get(id_usuario, ())]
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self._por_clave.values())
+
+    def __len__(self) -> int:
+        return len(self._por_clave)
+
+    def to_list(self) -> List[Dict]:
+        return list(self._por_clave.values())
+
+    @staticmethod
+    def from_list(prestamos: List[Dict]) -> "RegistroPrestamos":
+        registro = RegistroPrestamos()
+        for prestamo in prestamos:
+            registro.agregar(prestamo)
+        return registro
+
+# -----------------------------
+# Clase Existencias
+# -----------------------------
+class Existencias:
+    """Ejemplares físicos de cada ISBN.
+
+    Cada copia tiene un identificador "<isbn>-<n>". Por ISBN se guardan todas
+    sus copias y una pila con las que están en la estantería, de modo que
+    consultar cuántas hay, prestar y devolver son operaciones O(1).
+    """
+
+    def __init__(self):
+        self.ejemplares: Dict[str, List[str]] = {}
+        self.libres: Dict[str, List[str]] = {}
+        self._siguiente: Dict[str, int] = {}
+
+    def __contains__(self, isbn: str) -> bool:
+        return isbn in self.ejemplares
+
+    def __len__(self) -> int:
+        return len(self.ejemplares)
+
+    def total(self, isbn: str) -> int:
+        return len(self.ejemplares.get(isbn, ()))
+
+    def disponibles(self, isbn: str) -> int:
+        return len(self.libres.get(isbn, ()))
+
+    def prestados(self, isbn: str) -> int:
+        return self.total(isbn) - self.disponibles(isbn)
+
+    def cargar(self, ejemplar: str, isbn: str, disponible: bool):
+        """Incorpora una copia ya existente (al leer los datos guardados)."""
+        self.ejemplares.setdefault(isbn, []).append(ejemplar)
+        libres = self.libres.setdefault(isbn, [])
+        if disponible:
+            libres.append(ejemplar)
+        numero = int(ejemplar.rsplit("-", 1)[1])
+        self._siguiente[isbn] = max(self._siguiente.get(isbn, 1), numero + 1)
+
+    def añadir(self, isbn: str, cantidad: int = 1) -> List[str]:
+        """Da de alta copias nuevas, disponibles, y devuelve sus identificadores."""
+        numero = self._siguiente.get(isbn, 1)
+        nuevos = [f"{isbn}-{n}" for n in range(numero, numero + cantidad)]
+        self._siguiente[isbn] = numero + cantidad
+        self.ejemplares.setdefault(isbn, []).extend(nuevos)
+        self.libres.setdefault(isbn, []).extend(nuevos)
+        return nuevos
+
+    def retirar(self, isbn: str) -> Optional[str]:
+        """Quita del fondo una copia disponible (los números no se reutilizan)."""
+        libres = self.libres.get(isbn)
+        if not libres:
+            return None
+        ejemplar = libres.pop()
+        ejemplares = self.ejemplares[isbn]
+        ejemplares.remove(ejemplar)
+        if not ejemplares:
+            del self.ejemplares[isbn]
+            del self.libres[isbn]
+        return ejemplar
+
+    def tomar(self, isbn: str) -> Optional[str]:
+        libres = self.libres.get(isbn)
+        return libres.pop() if libres else None
+
+    def reponer(self, isbn: str, ejemplar: str):
+        self.libres[isbn].append(ejemplar)
+
+    def to_list(self) -> List[Dict]:
+        filas = []
+        for isbn, ejemplares in self.ejemplares.items():
+            libres = set(self.libres[isbn])
+            filas.extend({"ejemplar": e, "isbn": isbn, "disponible": e in libres} for e in ejemplares)
+        return filas
+
+# -----------------------------
+# Clase MotorBusqueda
+# -----------------------------
+# Palabras vacías del español que no se indexan
+PALABRAS_VACIAS = {
+    "a", "al", "ante", "con", "contra", "de", "del", "desde", "e", "el", "en", "entre",
+    "es", "hacia", "hasta", "la", "las", "lo", "los", "mas", "mi", "mis", "ni", "no",
+    "o", "para", "pero", "por", "que", "se", "sin", "sobre", "su", "sus", "te", "tras",
+    "u", "un", "una", "unas", "unos", "y", "ya"
+}
+# Sufijos que se recortan al obtener la raíz (del más largo al más corto)
+SUFIJOS = (
+    "amientos", "imientos", "aciones", "uciones", "amiento", "imiento", "adoras",
+    "adores", "ancias", "encias", "mente", "acion", "ucion", "adora", "ador", "ancia",
+    "encia", "ables", "ibles", "able", "ible", "istas", "ista", "osos", "osas", "oso",
+    "osa", "es", "s", "a", "o", "e"
+)
+
+
+class MotorBusqueda:
+    """Índice invertido con ranking BM25 sobre título y autor.
+
+    Las palabras se normalizan (sin mayúsculas ni tildes), se descartan las
+    palabras vacías y se reducen a su raíz. La última palabra de la consulta
+    también se compara como prefijo para la búsqueda mientras se escribe.
+    """
+
+    K1 = 1.2
+    B = 0.75
+    MAX_EXPANSIONES = 50
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.longitudes: Dict[str, int] = {}
+        self.longitud_total = 0
+        self.vocabulario: List[str] = []
+
+    @staticmethod
+    def raiz(palabra: str) -> str:
+        if palabra.isdigit():
+            return palabra
+        for sufijo in SUFIJOS:
+            if palabra.endswith(sufijo) and len(palabra) - len(sufijo) >= 3:
+                return palabra[:-len(sufijo)]
+        return palabra
+
+    @staticmethod
+    def palabras(texto: str) -> List[str]:
+        return [p for p in re.findall(r"\w+", IndiceLibros.normalizar(texto)) if p not in PALABRAS_VACIAS]
+
+    def terminos(self, texto: str) -> List[str]:
+        return [self.raiz(p) for p in self.palabras(texto)]
+
+    def agregar(self, libro: Libro, terminos_nuevos: Optional[List[str]] = None):
+        if libro.isbn in self.longitudes:
+            return
+        terminos = self.terminos(f"{libro.info[0]} {libro.info[1]}")
+        for termino in terminos:
+            docs = self.postings.get(termino)
+            if docs is None:
+                docs = self.postings[termino] = {}
+                if terminos_nuevos is None:
+                    bisect.insort(self.vocabulario, termino)
+                else:
+                    terminos_nuevos.append(termino)
+            docs[libro.isbn] = docs.get(libro.isbn, 0) + 1
+        self.longitudes[libro.isbn] = len(terminos)
+        self.longitud_total += len(terminos)
+
+    def agregar_lote(self, libros: List[Libro]):
+        # El vocabulario se ordena una sola vez en lugar de un insort por término nuevo
+        terminos_nuevos: List[str] = []
+        for libro in libros:
+            self.agregar(libro, terminos_nuevos)
+        if terminos_nuevos:
+            self.vocabulario.extend(terminos_nuevos)
+            self.vocabulario.sort()
+
+    def quitar(self, libro: Libro):
+        if libro.isbn not in self.longitudes:
+            return
+        for termino in set(self.terminos(f"{libro.info[0]} {libro.info[1]}")):
+            docs = self.postings.get(termino)
+            if docs is None:
+                continue
+            docs.pop(libro.isbn, None)
+            if not docs:
+                del self.postings[termino]
+                pos = bisect.bisect_left(self.vocabulario, termino)
+                if pos < len(self.vocabulario) and self.vocabulario[pos] == termino:
+                    del self.vocabulario[pos]
+        self.longitud_total -= self.longitudes.pop(libro.isbn)
+
+    def _con_prefijo(self, prefijo: str) -> List[str]:
+        inicio = bisect.bisect_left(self.vocabulario, prefijo)
+        encontrados = []
+        for termino in self.vocabulario[inicio:inicio + self.MAX_EXPANSIONES]:
+            if not termino.startswith(prefijo):
+                break
+            encontrados.append(termino)
+        return encontrados
+
+    def buscar(self, consulta: str, limite: int = 10, prefijo: bool = True) -> List[Tuple[str, float]]:
+        """Devuelve hasta `limite` pares (isbn, puntuación) ordenados por relevancia."""
+        palabras = self.palabras(consulta)
+        if not palabras or not self.longitudes:
+            return []
+        grupos = [[self.raiz(p)] for p in palabras]
+        if prefijo:
+            grupos[-1] = list(set(grupos[-1] + self._con_prefijo(palabras[-1])))
+        n = len(self.longitudes)
+        media = self.longitud_total / n or 1
+        puntuaciones: Dict[str, float] = {}
+        for grupo in grupos:
+            for termino in grupo:
+                docs = self.postings.get(termino)
+                if not docs:
+                    continue
+                idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+                for isbn, tf in docs.items():
+                    norma = tf + self.K1 * (1 - self.B + self.B * self.longitudes[isbn] / media)
+                    puntuaciones[isbn] = puntuaciones.get(isbn, 0.0) + idf * tf * (self.K1 + 1) / norma
+        return heapq.nlargest(limite, puntuaciones.items(), key=lambda item: item[1])
+
+    def guardar(self, ruta: str):
+        escribir_json(ruta, {"longitudes": self.longitudes, "postings": self.postings})
+
+    @staticmethod
+    def cargar(ruta: str, libros: Dict[str, Libro]) -> "MotorBusqueda":
+        """Carga el índice guardado; si falta o no coincide con los libros, lo reconstruye."""
+        motor = MotorBusqueda()
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                datos = json.load(f)
+            if datos["longitudes"].keys() == libros.keys():
+                motor.longitudes = datos["longitudes"]
+                motor.postings = datos["postings"]
+                motor.longitud_total = sum(motor.longitudes.values())
+                motor.vocabulario = sorted(motor.postings)
+                return motor
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            pass
+        for libro in libros.values():
+            motor.agregar(libro)
+        return motor
+
+# -----------------------------
+# Clase AgendaVencimientos
+# -----------------------------
+# Días de préstamo por defecto
+DIAS_PRESTAMO = 14
+
+
+class AgendaVencimientos:
+    """Colas de prioridad con los vencimientos de los préstamos activos.
+
+    `pendientes` guarda los que aún no vencen y `vencidos` los ya vencidos; al
+    consultar, los que pasan su fecha se mueven de una cola a la otra. Los
+    préstamos devueltos se borran de forma perezosa: se ignoran al salir del heap.
+    Cada préstamo programado recibe un número de secuencia propio, así una
+    entrada vieja no se confunde con un nuevo préstamo del mismo libro al mismo
+    usuario aunque venza en el mismo segundo.
+    """
+
+    def __init__(self):
+        self.activos: Dict[Tuple[str, str], int] = {}  # (id_usuario, isbn) -> secuencia vigente
+        self._secuencia = 0
+        self._pendientes: List[Tuple[float, int, str, str]] = []
+        self._vencidos: List[Tuple[float, int, str, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.activos)
+
+    def programar(self, id_usuario: str, isbn: str, vencimiento: float):
+        self._secuencia += 1
+        self.activos[(id_usuario, isbn)] = self._secuencia
+        heapq.heappush(self._pendientes, (vencimiento, self._secuencia, id_usuario, isbn))
+
+    def cancelar(self, id_usuario: str, isbn: str):
+        self.activos.pop((id_usuario, isbn), None)
+        if len(self._pendientes) + len(self._vencidos) > 2 * len(self.activos) + 64:
+            self._compactar()
+
+    def _vigente(self, entrada: Tuple[float, int, str, str]) -> bool:
+        return self.activos.get((entrada[2], entrada[3])) == entrada[1]
+
+    def _compactar(self):
+        self._pendientes = [e for e in self._pendientes if self._vigente(e)]
+        self._vencidos = [e for e in self._vencidos if self._vigente(e)]
+        heapq.heapify(self._pendientes)
+        heapq.heapify(self._vencidos)
+
+    def _avanzar(self, ahora: float):
+        while self._pendientes and self._pendientes[0][0] < ahora:
+            entrada = heapq.heappop(self._pendientes)
+            if self._vigente(entrada):
+                heapq.heappush(self._vencidos, entrada)
+
+    def _primeros(self, cola: List[Tuple[float, int, str, str]], n: int, limite: float = float("inf")):
+        # Saca hasta n entradas vigentes con vencimiento < limite y las vuelve a meter
+        tomadas = []
+        while cola and len(tomadas) < n and cola[0][0] < limite:
+            entrada = heapq.heappop(cola)
+            if self._vigente(entrada):
+                tomadas.append(entrada)
+        for entrada in tomadas:
+            heapq.heappush(cola, entrada)
+        return [(id_usuario, isbn, vencimiento) for vencimiento, _, id_usuario, isbn in tomadas]
+
+    def vencidos(self, n: int = 10, ahora: Optional[float] = None) -> List[Tuple[str, str, float]]:
+        """Los n préstamos vencidos hace más tiempo: (id_usuario, isbn, vencimiento)."""
+        self._avanzar(time.time() if ahora is None else ahora)
+        return self._primeros(self._vencidos, n)
+
+    def por_vencer(self, segundos: float = 24 * 3600, ahora: Optional[float] = None,
+                   n: int = 100) -> List[Tuple[str, str, float]]:
+        """Préstamos que vencen dentro de los próximos `segundos`."""
+        ahora = time.time() if ahora is None else ahora
+        self._avanzar(ahora)
+        return self._primeros(self._pendientes, n, ahora + segundos)
+
+# -----------------------------
+# Clase Recomendador
+# -----------------------------
+class Recomendador:
+    """Recomendaciones del tipo "quienes leyeron este libro también leyeron...".
+
+    Matriz dispersa de coocurrencias libro-libro: coocurrencias[x][y] es el
+    número de usuarios con x e y en su historial. Cada préstamo solo toca las
+    filas de los libros que ese usuario ya había leído, y el top de cada ISBN
+    queda en caché hasta que su fila cambia.
+    """
+
+    # Recomendaciones que se guardan por ISBN; pedir más no usa la caché
+    TAMANO_CACHE = 20
+
+    def __init__(self):
+        self.coocurrencias: Dict[str, Dict[str, int]] = {}
+        self._leidos: Dict[str, Set[str]] = {}
+        self._cache: Dict[str, List[Tuple[str, int]]] = {}
+
+    def registrar(self, id_usuario: str, isbn: str):
+        leidos = self._leidos.setdefault(id_usuario, set())
+        if isbn in leidos:
+            return
+        fila = self.coocurrencias.setdefault(isbn, {})
+        for otro in leidos:
+            fila[otro] = fila.get(otro, 0) + 1
+            otra_fila = self.coocurrencias[otro]
+            otra_fila[isbn] = otra_fila.get(isbn, 0) + 1
+            self._cache.pop(otro, None)
+        self._cache.pop(isbn, None)
+        leidos.add(isbn)
+
+    def quitar_usuario(self, id_usuario: str):
+        leidos = self._leidos.pop(id_usuario, set())
+        for isbn in leidos:
+            fila = self.coocurrencias[isbn]
+            for otro in leidos:
+                if otro != isbn:
+                    if fila[otro] == 1:
+                        del fila[otro]
+                    else:
+                        fila[otro] -= 1
+            self._cache.pop(isbn, None)
+
+    def _mejores(self, isbn: str, k: int) -> List[Tuple[str, int]]:
+        # Más lectores en común primero; a igualdad, por ISBN para que el orden sea estable
+        fila = self.coocurrencias.get(isbn, {})
+        return heapq.nsmallest(k, fila.items(), key=lambda par: (-par[1], par[0]))
+
+    def recomendar(self, isbn: str, k: int = 5) -> List[Tuple[str, int]]:
+        """Hasta k pares (isbn, lectores en común), de mayor a menor."""
+        if k > self.TAMANO_CACHE:
+            return self._mejores(isbn, k)
+        mejores = self._cache.get(isbn)
+        if mejores is None:
+            mejores = self._cache[isbn] = self._mejores(isbn, self.TAMANO_CACHE)
+        return mejores[:k]
+
+    @staticmethod
+    def desde_usuarios(usuarios) -> "Recomendador":
+        recomendador = Recomendador()
+        for usuario in usuarios:
+            for isbn in usuario.historial:
+                recomendador.registrar(usuario.id_usuario, isbn)
+        return recomendador
+
 # -----------------------------
 # Clase Usuario
 # -----------------------------
 class Usuario:
-    def __init__(self, nombre: str, id_usuario: str):
+    def __init__(self, nombre: str, id_usuario: str, catalogo: Optional[Dict[str, Libro]] = None):
         self.nombre: str = nombre
         self.id_usuario: str = id_usuario
-        self.libros_prestados: List[Libro] = []
-        self.historial: List[Libro] = []
+        # Se guardan ISBN; los datos de cada libro están una sola vez en el catálogo
+        self.libros_prestados: List[str] = []
+        self.historial: List[str] = []
+        self.catalogo: Dict[str, Libro] = catalogo if catalogo is not None else {}
 
     def listar_libros_prestados(self):
         if not self.libros_prestados:
             return f"{self.nombre} no tiene libros prestados."
-        return [str(libro) for libro in self.libros_prestados]
+        return [str(self.catalogo[isbn]) for isbn in self.libros_prestados]
 
     def listar_historial(self):
         if not self.historial:
             return f"{self.nombre} no tiene historial de préstamos."
-        return [str(libro) for libro in self.historial]
+        return [str(self.catalogo[isbn]) for isbn in self.historial]
 
     def to_dict(self):
         return {
             "nombre": self.nombre,
             "id_usuario": self.id_usuario,
-            "libros_prestados": [libro.to_dict() for libro in self.libros_prestados],
-            "historial": [libro.to_dict() for libro in self.historial]
+            "libros_prestados": list(self.libros_prestados),
+            "historial": list(self.historial)
         }
 
+# -----------------------------
+# Lectura de JSON por partes y escritura atómica
+# -----------------------------
+def escribir_json(ruta: str, datos, indent: Optional[int] = None):
+    """Escribe en un temporal y lo reemplaza: un corte nunca deja el archivo a medias."""
+    temporal = ruta + ".tmp"
+    try:
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(datos, f, indent=indent, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+def leer_elementos_json(ruta: str, tamano_bloque: int = 1 << 16) -> Iterator:
+    """Recorre uno a uno los elementos de un arreglo JSON sin cargar todo el archivo."""
+    decodificador = json.JSONDecoder()
+    with open(ruta, "r", encoding="utf-8") as f:
+        buffer = f.read(tamano_bloque)
+        fin = not buffer
+        pos = 0
+        abierto = False
+        while True:
+            while pos < len(buffer) and (buffer[pos].isspace() or (abierto and buffer[pos] == ",")):
+                pos += 1
+            if pos >= len(buffer):
+                if fin:
+                    if not abierto:
+                        return
+                    raise json.JSONDecodeError("Arreglo JSON sin cerrar", buffer, pos)
+                bloque = f.read(tamano_bloque)
+                fin = not bloque
+                buffer, pos = buffer[pos:] + bloque, 0
+                continue
+            if not abierto:
+                if buffer[pos] != "[":
+                    raise json.JSONDecodeError("Se esperaba un arreglo JSON", buffer, pos)
+                abierto = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                elemento, nuevo = decodificador.raw_decode(buffer, pos)
+                if nuevo == len(buffer) and not fin:
+                    # Podría estar cortado al final del bloque: se lee más y se reintenta
+                    raise json.JSONDecodeError("Elemento incompleto", buffer, pos)
+            except json.JSONDecodeError:
+                if fin:
+                    raise
+                bloque = f.read(tamano_bloque)
+                fin = not bloque
+                buffer, pos = buffer[pos:] + bloque, 0
+                continue
+            yield elemento
+            pos = nuevo
+
+
+def leer_archivo_json(ruta: str, crear_libros: bool) -> Tuple[List, float]:
+    """Lee el arreglo completo y devuelve (elementos, segundos).
+
+    Es de módulo para poder ejecutarla en otro proceso; la lista hace falta
+    porque el resultado vuelve al proceso principal de una sola vez.
+    """
+    inicio = time.perf_counter()
+    if crear_libros:
+        elementos = [Libro(**d) for d in leer_elementos_json(ruta)]
+    else:
+        elementos = list(leer_elementos_json(ruta))
+    return elementos, time.perf_counter() - inicio
+
+
+class LectorJSON:
+    """Lee un arreglo JSON en un hilo y entrega sus elementos por bloques.
+
+    La cola está acotada: si quien consume va más lento, el hilo espera, así
+    que en memoria solo hay unos pocos bloques a la vez. Con un ejecutor de
+    procesos el archivo se lee entero en otro proceso y llega como un bloque.
+    `leidos` cuenta los elementos entregados y `segundos` es el tiempo de
+    lectura del archivo, sin contar las esperas.
+    """
+
+    TAMANO_BLOQUE = 1000
+    MAX_BLOQUES = 4
+
+    def __init__(self, ruta: str, crear_libros: bool, hilos: ThreadPoolExecutor,
+                 procesos: Optional[ProcessPoolExecutor] = None):
+        self.ruta = ruta
+        self.leidos = 0
+        self.segundos = 0.0
+        self._cola: queue.Queue = queue.Queue(self.MAX_BLOQUES)
+        self._terminado = False
+        hilos.submit(self._leer, crear_libros, procesos)
+
+    def _leer(self, crear_libros: bool, procesos: Optional[ProcessPoolExecutor]):
+        try:
+            if procesos is not None:
+                elementos, segundos = procesos.submit(leer_archivo_json, self.ruta, crear_libros).result()
+                self._cola.put(("bloque", elementos))
+                self._cola.put(("fin", segundos))
+                return
+            inicio = time.perf_counter()
+            espera = 0.0
+            bloque = []
+            for d in leer_elementos_json(self.ruta):
+                bloque.append(Libro(**d) if crear_libros else d)
+                if len(bloque) == self.TAMANO_BLOQUE:
+                    antes = time.perf_counter()
+                    self._cola.put(("bloque", bloque))
+                    espera += time.perf_counter() - antes
+                    bloque = []
+            if bloque:
+                antes = time.perf_counter()
+                self._cola.put(("bloque", bloque))
+                espera += time.perf_counter() - antes
+            self._cola.put(("fin", time.perf_counter() - inicio - espera))
+        except Exception as e:
+            self._cola.put(("error", e))
+
+    def __iter__(self) -> Iterator:
+        while not self._terminado:
+            tipo, valor = self._cola.get()
+            if tipo == "bloque":
+                for elemento in valor:
+                    self.leidos += 1
+                    yield elemento
+                continue
+            self._terminado = True
+            if tipo == "error":
+                raise valor
+            self.segundos = valor
+
+    def descartar(self):
+        """Vacía la cola hasta el final para que el hilo lector termine."""
+        while not self._terminado:
+            tipo, _ = self._cola.get()
+            self._terminado = tipo != "bloque"
+
+# -----------------------------
+# Almacenamiento (persistencia intercambiable)
+# -----------------------------
+# "json" guarda todo al salir; "sqlite" guarda cada operación en biblioteca.db
+ALMACENAMIENTO = "json"
+ARCHIVO_SQLITE = "biblioteca.db"
+
+
+class Almacenamiento:
+    """Interfaz de persistencia de Biblioteca.
+
+    Biblioteca llama a cada método después de aplicar el cambio en memoria.
+    """
+
+    def cargar(self, biblioteca: "Biblioteca"):
+        pass
+
+    def guardar(self, biblioteca: "Biblioteca"):
+        pass
+
+    def libro_añadido(self, libro: Libro, ejemplares: List[str]):
+        pass
+
+    def libro_quitado(self, isbn: str, ejemplar: str):
+        pass
+
+    def usuario_registrado(self, usuario: "Usuario"):
+        pass
+
+    def usuario_dado_de_baja(self, id_usuario: str):
+        pass
+
+    def libro_prestado(self, prestamo: Dict):
+        pass
+
+    def libro_devuelto(self, id_usuario: str, isbn: str):
+        pass
+
+    def buscar_libros(self, campo: str, texto: str, incluir_prestados: bool = False) -> Optional[List[str]]:
+        """ISBN que coinciden, o None si se deben usar los índices en memoria."""
+        return None
+
+    @contextlib.contextmanager
+    def lote(self, biblioteca: "Biblioteca"):
+        """Agrupa los cambios de una operación por lotes para persistirlos una sola vez."""
+        yield
+
+    def cerrar(self):
+        pass
+
+
+class AlmacenamientoJSON(Almacenamiento):
+    """Archivos JSON separados, escritos completos al guardar."""
+
+    def cargar(self, biblioteca: "Biblioteca"):
+        biblioteca.cargar_datos()
+
+    def guardar(self, biblioteca: "Biblioteca"):
+        biblioteca.guardar_datos()
+
+    @contextlib.contextmanager
+    def lote(self, biblioteca: "Biblioteca"):
+        yield
+        biblioteca.guardar_datos(silencioso=True)
+
+
+class AlmacenamientoSQLite(Almacenamiento):
+    """Base de datos SQLite de un solo archivo con una transacción por operación.
+
+    Si la base está vacía, la primera carga importa los archivos JSON.
+    Las operaciones por lotes comparten una única transacción.
+    """
+
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS libros (
+            isbn TEXT PRIMARY KEY,
+            titulo TEXT NOT NULL,
+            autor TEXT NOT NULL,
+            categoria TEXT NOT NULL,
+            titulo_norm TEXT NOT NULL,
+            autor_norm TEXT NOT NULL,
+            categoria_norm TEXT NOT NULL,
+            disponible INTEGER NOT NULL DEFAULT 1
+        );
+        CREATE INDEX IF NOT EXISTS idx_libros_titulo ON libros (titulo_norm);
+        CREATE INDEX IF NOT EXISTS idx_libros_autor ON libros (autor_norm);
+        CREATE INDEX IF NOT EXISTS idx_libros_categoria ON libros (categoria_norm);
+        CREATE TABLE IF NOT EXISTS usuarios (
+            id_usuario TEXT PRIMARY KEY,
+            nombre TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS prestamos (
+            id_usuario TEXT NOT NULL,
+            isbn TEXT NOT NULL,
+            nombre_usuario TEXT NOT NULL,
+            fecha_prestamo TEXT,
+            fecha_vencimiento TEXT,
+            ejemplar TEXT,
+            PRIMARY KEY (id_usuario, isbn)
+        );
+        CREATE TABLE IF NOT EXISTS ejemplares (
+            ejemplar TEXT PRIMARY KEY,
+            isbn TEXT NOT NULL,
+            disponible INTEGER NOT NULL DEFAULT 1
+        );
+        CREATE INDEX IF NOT EXISTS idx_ejemplares_isbn ON ejemplares (isbn, disponible);
+        CREATE INDEX IF NOT EXISTS idx_prestamos_isbn ON prestamos (isbn);
+        CREATE TABLE IF NOT EXISTS historial (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id_usuario TEXT NOT NULL,
+            isbn TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_historial_usuario ON historial (id_usuario);
+    """
+
+    # Consultas de búsqueda parametrizadas (sqlite3 reutiliza la sentencia preparada)
+    SQL_BUSCAR = {
+        campo: f"SELECT isbn FROM libros WHERE {campo}_norm = ? AND disponible = 1"
+        for campo in IndiceLibros.CAMPOS
+    }
+    SQL_BUSCAR_CON_PRESTADOS = {
+        campo: f"SELECT isbn FROM libros WHERE {campo}_norm = ? "
+               f"AND (disponible = 1 OR isbn IN (SELECT isbn FROM prestamos))"
+        for campo in IndiceLibros.CAMPOS
+    }
+
+    # Columnas explícitas: en bases migradas el orden depende de los ALTER TABLE
+    COLUMNAS_PRESTAMO = "(id_usuario, isbn, nombre_usuario, fecha_prestamo, fecha_vencimiento, ejemplar)"
+    SQL_ACTUALIZAR_DISPONIBLE = (
+        "UPDATE libros SET disponible = EXISTS "
+        "(SELECT 1 FROM ejemplares WHERE isbn = ? AND disponible = 1) WHERE isbn = ?"
+    )
+
+    def __init__(self, ruta: str = ARCHIVO_SQLITE):
+        self.conexion = sqlite3.connect(ruta)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self._en_lote = False
+        self.conexion.executescript(self.ESQUEMA)
+        # Bases creadas antes de que los préstamos tuvieran fechas y ejemplar
+        columnas = {fila[1] for fila in self.conexion.execute("PRAGMA table_info(prestamos)")}
+        with self.conexion:
+            for columna in ("fecha_prestamo", "fecha_vencimiento", "ejemplar"):
+                if columna not in columnas:
+                    self.conexion.execute(f"ALTER TABLE prestamos ADD COLUMN {columna} TEXT")
+
+    @staticmethod
+    def _fila_libro(libro: Libro, disponible: bool) -> Tuple:
+        titulo, autor = libro.info
+        normalizar = IndiceLibros.normalizar
+        return (libro.isbn, titulo, autor, libro.categoria,
+                normalizar(titulo), normalizar(autor), normalizar(libro.categoria), int(disponible))
+
+    def cargar(self, biblioteca: "Biblioteca"):
+        vacia = self.conexion.execute(
+            "SELECT NOT EXISTS (SELECT 1 FROM libros) AND NOT EXISTS (SELECT 1 FROM usuarios)"
+        ).fetchone()[0]
+        if vacia:
+            # Primera ejecución: se importan los archivos JSON existentes
+            biblioteca.cargar_datos()
+            self.importar(biblioteca)
+            return
+        disponibles = []
+        for isbn, titulo, autor, categoria, disponible in self.conexion.execute(
+                "SELECT isbn, titulo, autor, categoria, disponible FROM libros"):
+            libro = Libro(titulo, autor, categoria, isbn)
+            biblioteca.catalogo[isbn] = libro
+            if disponible:
+                disponibles.append(libro)
+        for ejemplar, isbn, disponible in self.conexion.execute(
+                "SELECT ejemplar, isbn, disponible FROM ejemplares ORDER BY rowid"):
+            biblioteca.existencias.cargar(ejemplar, isbn, disponible)
+        for id_usuario, nombre in self.conexion.execute("SELECT id_usuario, nombre FROM usuarios"):
+            usuario = Usuario(nombre, id_usuario, biblioteca.catalogo)
+            biblioteca.usuarios_ids.add(id_usuario)
+            biblioteca.usuarios[id_usuario] = usuario
+        for id_usuario, isbn in self.conexion.execute(
+                "SELECT id_usuario, isbn FROM historial ORDER BY id"):
+            biblioteca.usuarios[id_usuario].historial.append(isbn)
+        for id_usuario, isbn, nombre_usuario, fecha_prestamo, fecha_vencimiento, ejemplar in self.conexion.execute(
+                "SELECT id_usuario, isbn, nombre_usuario, fecha_prestamo, fecha_vencimiento, ejemplar "
+                "FROM prestamos ORDER BY rowid"):
+            libro = biblioteca.catalogo[isbn]
+            biblioteca.usuarios[id_usuario].libros_prestados.append(isbn)
+            biblioteca.indice_prestados.agregar(libro)
+            prestamo = {
+                "id_usuario": id_usuario,
+                "nombre_usuario": nombre_usuario,
+                "libro": libro.to_dict()
+            }
+            if fecha_vencimiento:
+                prestamo["fecha_prestamo"] = fecha_prestamo
+                prestamo["fecha_vencimiento"] = fecha_vencimiento
+            if ejemplar:
+                prestamo["ejemplar"] = ejemplar
+            biblioteca.prestamos.agregar(prestamo)
+        if not biblioteca.existencias:
+            # Base anterior a los ejemplares: se crean las copias y se guardan
+            biblioteca._migrar_existencias(disponibles)
+            self.importar(biblioteca)
+        biblioteca._indexar_disponibles()
+        biblioteca.motor_busqueda = MotorBusqueda.cargar("indice_busqueda.json", biblioteca.libros)
+        biblioteca.programar_prestamos()
+        biblioteca.recomendador = Recomendador.desde_usuarios(biblioteca.usuarios.values())
+        print("Datos cargados correctamente desde la base de datos SQLite.")
+
+    def importar(self, biblioteca: "Biblioteca"):
+        """Vuelca en la base todo el estado en memoria (una sola transacción)."""
+        with self.conexion:
+            for tabla in ("libros", "usuarios", "prestamos", "historial", "ejemplares"):
+                self.conexion.execute(f"DELETE FROM {tabla}")
+            self.conexion.executemany(
+                "INSERT INTO libros VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._fila_libro(libro, isbn in biblioteca.libros) for isbn, libro in biblioteca.catalogo.items()))
+            self.conexion.executemany(
+                "INSERT INTO usuarios VALUES (?, ?)",
+                ((u.id_usuario, u.nombre) for u in biblioteca.usuarios.values()))
+            self.conexion.executemany(
+                "INSERT INTO historial (id_usuario, isbn) VALUES (?, ?)",
+                ((u.id_usuario, isbn) for u in biblioteca.usuarios.values() for isbn in u.historial))
+            self.conexion.executemany(
+                f"INSERT OR REPLACE INTO prestamos {self.COLUMNAS_PRESTAMO} VALUES (?, ?, ?, ?, ?, ?)",
+                ((p["id_usuario"], p["libro"]["isbn"], p["nombre_usuario"],
+                  p.get("fecha_prestamo"), p.get("fecha_vencimiento"), p.get("ejemplar"))
+                 for p in biblioteca.prestamos))
+            self.conexion.executemany(
+                "INSERT INTO ejemplares VALUES (?, ?, ?)",
+                ((e["ejemplar"], e["isbn"], int(e["disponible"])) for e in biblioteca.existencias.to_list()))
+
+    def guardar(self, biblioteca: "Biblioteca"):
+        # Los datos ya están confirmados operación a operación
+        biblioteca.motor_busqueda.guardar("indice_busqueda.json")
+        print("Datos guardados correctamente en la base de datos SQLite.")
+
+    def _transaccion(self):
+        # Dentro de un lote no se confirma cada operación por separado
+        return contextlib.nullcontext() if self._en_lote else self.conexion
+
+    @contextlib.contextmanager
+    def lote(self, biblioteca: "Biblioteca"):
+        self._en_lote = True
+        try:
+            with self.conexion:
+                yield
+        finally:
+            self._en_lote = False
+
+    def libro_añadido(self, libro: Libro, ejemplares: List[str]):
+        with self._transaccion():
+            self.conexion.execute("INSERT OR REPLACE INTO libros VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                  self._fila_libro(libro, True))
+            self.conexion.executemany("INSERT INTO ejemplares VALUES (?, ?, 1)",
+                                      ((ejemplar, libro.isbn) for ejemplar in ejemplares))
+
+    def libro_quitado(self, isbn: str, ejemplar: str):
+        # El libro sigue en el catálogo por si aparece en historiales
+        with self._transaccion():
+            self.conexion.execute("DELETE FROM ejemplares WHERE ejemplar = ?", (ejemplar,))
+            self.conexion.execute(self.SQL_ACTUALIZAR_DISPONIBLE, (isbn, isbn))
+
+    def usuario_registrado(self, usuario: "Usuario"):
+        with self._transaccion():
+            self.conexion.execute("INSERT INTO usuarios VALUES (?, ?)", (usuario.id_usuario, usuario.nombre))
+
+    def usuario_dado_de_baja(self, id_usuario: str):
+        with self._transaccion():
+            self.conexion.execute("DELETE FROM usuarios WHERE id_usuario = ?", (id_usuario,))
+            self.conexion.execute("DELETE FROM prestamos WHERE id_usuario = ?", (id_usuario,))
+            self.conexion.execute("DELETE FROM historial WHERE id_usuario = ?", (id_usuario,))
+
+    def libro_prestado(self, prestamo: Dict):
+        isbn = prestamo["libro"]["isbn"]
+        with self._transaccion():
+            self.conexion.execute("UPDATE ejemplares SET disponible = 0 WHERE ejemplar = ?", (prestamo["ejemplar"],))
+            self.conexion.execute(self.SQL_ACTUALIZAR_DISPONIBLE, (isbn, isbn))
+            self.conexion.execute(f"INSERT OR REPLACE INTO prestamos {self.COLUMNAS_PRESTAMO} VALUES (?, ?, ?, ?, ?, ?)",
+                                  (prestamo["id_usuario"], isbn, prestamo["nombre_usuario"],
+                                   prestamo["fecha_prestamo"], prestamo["fecha_vencimiento"], prestamo["ejemplar"]))
+            self.conexion.execute("INSERT INTO historial (id_usuario, isbn) VALUES (?, ?)",
+                                  (prestamo["id_usuario"], isbn))
+
+    def libro_devuelto(self, id_usuario: str, isbn: str):
+        with self._transaccion():
+            self.conexion.execute("UPDATE ejemplares SET disponible = 1 WHERE ejemplar = "
+                                  "(SELECT ejemplar FROM prestamos WHERE id_usuario = ? AND isbn = ?)",
+                                  (id_usuario, isbn))
+            self.conexion.execute("DELETE FROM prestamos WHERE id_usuario = ? AND isbn = ?", (id_usuario, isbn))
+            self.conexion.execute("UPDATE libros SET disponible = 1 WHERE isbn = ?", (isbn,))
+
+    def buscar_libros(self, campo: str, texto: str, incluir_prestados: bool = False) -> List[str]:
+        """ISBN de los libros cuyo campo coincide con el texto (misma normalización que IndiceLibros)."""
+        consultas = self.SQL_BUSCAR_CON_PRESTADOS if incluir_prestados else self.SQL_BUSCAR
+        return [fila[0] for fila in self.conexion.execute(consultas[campo], (IndiceLibros.normalizar(texto),))]
+
+    def cerrar(self):
+        self.conexion.close()
+
 # -----------------------------
 # Clase Biblioteca
 # -----------------------------
 class Biblioteca:
-    def __init__(self):
+    def __init__(self, almacenamiento: Optional[Almacenamiento] = None):
+        self.almacenamiento: Almacenamiento = almacenamiento or AlmacenamientoJSON()
         self.libros: Dict[str, Libro] = {}
+        # Catálogo compartido: un único Libro por ISBN (disponible, prestado o en historiales)
+        self.catalogo: Dict[str, Libro] = {}
         self.usuarios_ids: Set[str] = set()
         self.usuarios: Dict[str, Usuario] = {}
-        self.prestamos: List[Dict] = []
+        self.prestamos: RegistroPrestamos = RegistroPrestamos()
+        # Ejemplares de cada ISBN; self.libros solo tiene los títulos con alguna copia libre
+        self.existencias = Existencias()
+        self.agenda = AgendaVencimientos()
+        self.recomendador = Recomendador()
+        # Índices de búsqueda de libros disponibles y de libros prestados
+        self.indice_disponibles = IndiceLibros()
+        self.indice_prestados = IndiceLibros()
+        # Búsqueda de texto completo sobre los libros disponibles
+        self.motor_busqueda = MotorBusqueda()
 
     # Libros
-    def añadir_libro(self, libro: Libro):
-        if libro.isbn in self.libros:
-            print("Ese ISBN ya existe.")
+    # Con indexar=False no se tocan los índices de búsqueda: las operaciones por
+    # lotes los ponen al día al final con _reindexar, una vez por ISBN.
+    def _poner_disponible(self, libro: Libro, indexar: bool = True):
+        self.libros[libro.isbn] = libro
+        if indexar:
+            self.indice_disponibles.agregar(libro)
+            self.motor_busqueda.agregar(libro)
+
+    def _quitar_disponible(self, isbn: str, indexar: bool = True) -> Libro:
+        libro = self.libros.pop(isbn)
+        if indexar:
+            self.indice_disponibles.quitar(libro)
+            self.motor_busqueda.quitar(libro)
+        return libro
+
+    def _reindexar(self, isbns: Set[str]):
+        """Ajusta los índices de cada ISBN a su estado actual (disponible y/o prestado)."""
+        nuevos = []
+        for isbn in isbns:
+            libro = self.catalogo[isbn]
+            if isbn in self.libros:
+                self.indice_disponibles.agregar(libro)
+                nuevos.append(libro)
+            else:
+                self.indice_disponibles.quitar(libro)
+                self.motor_busqueda.quitar(libro)
+            if self.existencias.prestados(isbn):
+                self.indice_prestados.agregar(libro)
+            else:
+                self.indice_prestados.quitar(libro)
+        self.motor_busqueda.agregar_lote(nuevos)
+
+    def _añadir(self, libro: Libro, ejemplares: int = 1, indexar: bool = True) -> Libro:
+        # Si el ISBN ya estaba en el catálogo se conservan sus datos y solo se suman copias
+        libro = self.catalogo.setdefault(libro.isbn, libro)
+        nuevos = self.existencias.añadir(libro.isbn, ejemplares)
+        if libro.isbn not in self.libros:
+            self._poner_disponible(libro, indexar)
+        self.almacenamiento.libro_añadido(libro, nuevos)
+        return libro
+
+    def añadir_libro(self, libro: Libro, ejemplares: int = 1):
+        if ejemplares < 1:
+            print("El número de ejemplares debe ser al menos 1.")
+        elif libro.isbn in self.existencias:
+            libro = self._añadir(libro, ejemplares)
+            print(f"Ejemplares añadidos: {libro} (total: {self.existencias.total(libro.isbn)})")
         else:
-            self.libros[libro.isbn] = libro
-            print(f"Libro añadido: {libro}")
+            self._añadir(libro, ejemplares)
+            print(f"Libro añadido: {libro} ({ejemplares} ejemplar(es))")
 
     def quitar_libro(self, isbn: str):
-        if isbn in self.libros:
-            libro = self.libros.pop(isbn)
-            print(f"Libro eliminado: {libro}")
-        else:
-            print("No existe ese libro.")
+        """Retira del fondo un ejemplar disponible de ese ISBN."""
+        ejemplar = self.existencias.retirar(isbn)
+        if ejemplar is None:
+            if isbn in self.existencias:
+                print("No quedan ejemplares disponibles de ese libro.")
+            else:
+                print("No existe ese libro.")
+            return
+        if not self.existencias.disponibles(isbn):
+            self._quitar_disponible(isbn)
+        self.almacenamiento.libro_quitado(isbn, ejemplar)
+        print(f"Ejemplar eliminado: {self.catalogo[isbn]} (quedan {self.existencias.total(isbn)})")
 
     # Usuarios
+    def _registrar(self, usuario: Usuario):
+        usuario.catalogo = self.catalogo
+        self.usuarios_ids.add(usuario.id_usuario)
+        self.usuarios[usuario.id_usuario] = usuario
+        self.almacenamiento.usuario_registrado(usuario)
+
     def registrar_usuario(self, usuario: Usuario):
         if usuario.id_usuario in self.usuarios_ids:
             print("ID de usuario ya registrado.")
         else:
-            self.usuarios_ids.add(usuario.id_usuario)
-            self.usuarios[usuario.id_usuario] = usuario
+            self._registrar(usuario)
             print(f"Usuario registrado: {usuario.nombre}")
 
     def dar_baja_usuario(self, id_usuario: str):
         if id_usuario in self.usuarios_ids:
-            usuario = self.usuarios.pop(id_usuario)
+            usuario = self.usuarios[id_usuario]
+            # Sus préstamos se cierran como devoluciones: las copias vuelven a la estantería
+            devueltos = len(usuario.libros_prestados)
+            for isbn in list(usuario.libros_prestados):
+                self._devolver(isbn, usuario)
+            del self.usuarios[id_usuario]
             self.usuarios_ids.remove(id_usuario)
-            self.prestamos = [p for p in self.prestamos if p["id_usuario"] != id_usuario]
-            print(f"Usuario dado de baja: {usuario.nombre}")
+            self.recomendador.quitar_usuario(id_usuario)
+            self.almacenamiento.usuario_dado_de_baja(id_usuario)
+            if devueltos:
+                print(f"Usuario dado de baja: {usuario.nombre} ({devueltos} libro(s) devuelto(s))")
+            else:
+                print(f"Usuario dado de baja: {usuario.nombre}")
         else:
             print("No existe ese usuario.")
 
     # Préstamos
-    def prestar_libro(self, isbn: str, id_usuario: str):
-        if isbn not in self.libros:
-            print("No hay libro con ese ISBN.")
-            return
+    def _validar_prestamo(self, isbn: str, id_usuario: str, reservados: int = 0) -> Optional[str]:
+        if self.existencias.disponibles(isbn) <= reservados:
+            if isbn in self.existencias:
+                return "No quedan ejemplares disponibles de ese libro."
+            return "No hay libro con ese ISBN."
         if id_usuario not in self.usuarios_ids:
-            print("No hay usuario con ese ID.")
-            return
-        libro = self.libros.pop(isbn)
+            return "No hay usuario con ese ID."
+        if self.prestamos.obtener(id_usuario, isbn) is not None:
+            return "El usuario ya tiene un ejemplar de ese libro."
+        return None
+
+    def _prestar(self, isbn: str, id_usuario: str, dias: int, indexar: bool = True) -> Usuario:
+        ejemplar = self.existencias.tomar(isbn)
+        if not self.existencias.disponibles(isbn):
+            self._quitar_disponible(isbn, indexar)
+        libro = self.catalogo[isbn]
+        if indexar:
+            self.indice_prestados.agregar(libro)
         usuario = self.usuarios[id_usuario]
-        usuario.libros_prestados.append(libro)
-        usuario.historial.append(libro)
-        self.prestamos.append({
+        usuario.libros_prestados.append(isbn)
+        usuario.historial.append(isbn)
+        self.recomendador.registrar(id_usuario, isbn)
+        fecha_prestamo = datetime.now().replace(microsecond=0)
+        fecha_vencimiento = fecha_prestamo + timedelta(days=dias)
+        prestamo = {
             "id_usuario": id_usuario,
             "nombre_usuario": usuario.nombre,
-            "libro": libro.to_dict()
-        })
+            "libro": libro.to_dict(),
+            "ejemplar": ejemplar,
+            "fecha_prestamo": fecha_prestamo.isoformat(),
+            "fecha_vencimiento": fecha_vencimiento.isoformat()
+        }
+        self.prestamos.agregar(prestamo)
+        self.agenda.programar(id_usuario, isbn, fecha_vencimiento.timestamp())
+        self.almacenamiento.libro_prestado(prestamo)
+        return usuario
+
+    def prestar_libro(self, isbn: str, id_usuario: str, dias: int = DIAS_PRESTAMO):
+        error = self._validar_prestamo(isbn, id_usuario)
+        if error:
+            print(error)
+            return
+        usuario = self._prestar(isbn, id_usuario, dias)
         print(f"Libro prestado a {usuario.nombre}")
 
+    def _devolver(self, isbn: str, usuario: Usuario, indexar: bool = True):
+        usuario.libros_prestados.remove(isbn)
+        prestamo = self.prestamos.quitar(usuario.id_usuario, isbn)
+        self.existencias.reponer(isbn, prestamo["ejemplar"])
+        libro = self.catalogo[isbn]
+        if indexar and not self.existencias.prestados(isbn):
+            self.indice_prestados.quitar(libro)
+        self.agenda.cancelar(usuario.id_usuario, isbn)
+        self.almacenamiento.libro_devuelto(usuario.id_usuario, isbn)
+        if isbn not in self.libros:
+            self._poner_disponible(libro, indexar)
+
     def devolver_libro(self, isbn: str, id_usuario: str):
         if id_usuario not in self.usuarios_ids:
             print("No hay usuario con ese ID.")
             return
         usuario = self.usuarios[id_usuario]
-        for libro in usuario.libros_prestados:
-            if libro.isbn == isbn:
-                usuario.libros_prestados.remove(libro)
-                self.libros[isbn] = libro
-                self.prestamos = [p for p in self.prestamos if not (p["id_usuario"] == id_usuario and p["libro"]["isbn"] == isbn)]
-                print(f"Libro devuelto por {usuario.nombre}")
-                return
+        if isbn in usuario.libros_prestados:
+            self._devolver(isbn, usuario)
+            print(f"Libro devuelto por {usuario.nombre}")
+            return
         print(f"{usuario.nombre} no tiene ese libro.")
 
-    # Búsquedas
-    def buscar_por_titulo(self, titulo: str):
-        return [libro for libro in self.libros.values() if libro.info[0].lower() == titulo.lower()]
+    # Operaciones por lotes
+    # Validan todo el lote primero, aplican los cambios válidos, actualizan los
+    # índices de búsqueda una vez por ISBN y persisten una sola vez.
+    # No imprimen nada: devuelven un resultado por elemento, en el mismo orden de entrada.
+    @staticmethod
+    def _resultado(clave, ok: bool, mensaje: str) -> Dict:
+        return {"clave": clave, "ok": ok, "mensaje": mensaje}
 
-    def buscar_por_autor(self, autor: str):
-        return [libro for libro in self.libros.values() if libro.info[1].lower() == autor.lower()]
+    def añadir_libros(self, libros: List) -> List[Dict]:
+        """Añade varios libros: objetos Libro (un ejemplar) o diccionarios como los
+        de libros.json con una clave opcional "ejemplares"."""
+        resultados, validos = [], []
+        for libro in libros:
+            ejemplares = 1
+            if isinstance(libro, dict):
+                try:
+                    ejemplares = int(libro.get("ejemplares", 1))
+                    libro = Libro(libro["titulo"], libro["autor"], libro["categoria"], libro["isbn"])
+                except (KeyError, TypeError, AttributeError, ValueError) as e:
+                    resultados.append(self._resultado(libro.get("isbn"), False, f"Datos inválidos: {e}"))
+                    continue
+            if ejemplares < 1:
+                resultados.append(self._resultado(libro.isbn, False, "El número de ejemplares debe ser al menos 1."))
+                continue
+            validos.append((libro, ejemplares))
+            resultados.append(self._resultado(libro.isbn, True, f"{ejemplares} ejemplar(es) añadido(s)."))
+        if validos:
+            with self.almacenamiento.lote(self):
+                for libro, ejemplares in validos:
+                    self._añadir(libro, ejemplares, indexar=False)
+                self._reindexar({libro.isbn for libro, _ in validos})
+        return resultados
 
-    def buscar_por_categoria(self, categoria: str):
-        return [libro for libro in self.libros.values() if libro.categoria.lower() == categoria.lower()]
+    def registrar_usuarios(self, usuarios: List[Usuario]) -> List[Dict]:
+        resultados, validos, vistos = [], [], set()
+        for usuario in usuarios:
+            if usuario.id_usuario in self.usuarios_ids or usuario.id_usuario in vistos:
+                resultados.append(self._resultado(usuario.id_usuario, False, "ID de usuario ya registrado."))
+                continue
+            vistos.add(usuario.id_usuario)
+            validos.append(usuario)
+            resultados.append(self._resultado(usuario.id_usuario, True, "Usuario registrado."))
+        if validos:
+            with self.almacenamiento.lote(self):
+                for usuario in validos:
+                    self._registrar(usuario)
+        return resultados
 
-    # Guardado y carga de datos en archivos JSON separados
-    def guardar_datos(self):
-        with open("libros.json", "w", encoding="utf-8") as f:
-            json.dump([libro.to_dict() for libro in self.libros.values()], f, indent=4, ensure_ascii=False)
-        with open("usuarios.json", "w", encoding="utf-8") as f:
-            json.dump([usuario.to_dict() for usuario in self.usuarios.values()], f, indent=4, ensure_ascii=False)
-        with open("prestamos.json", "w", encoding="utf-8") as f:
-            json.dump(self.prestamos, f, indent=4, ensure_ascii=False)
-        print("Datos guardados correctamente en archivos JSON separados.")
+    def prestar_lote(self, prestamos: List[Tuple[str, str]], dias: int = DIAS_PRESTAMO) -> List[Dict]:
+        """Presta cada (isbn, id_usuario) mientras queden ejemplares de ese ISBN."""
+        resultados, validos = [], []
+        reservados: Dict[str, int] = {}
+        vistos = set()
+        for isbn, id_usuario in prestamos:
+            clave = (isbn, id_usuario)
+            error = self._validar_prestamo(isbn, id_usuario, reservados.get(isbn, 0))
+            if error is None and clave in vistos:
+                error = "El usuario ya tiene un ejemplar de ese libro."
+            if error:
+                resultados.append(self._resultado(clave, False, error))
+                continue
+            reservados[isbn] = reservados.get(isbn, 0) + 1
+            vistos.add(clave)
+            validos.append(clave)
+            resultados.append(self._resultado(clave, True, "Libro prestado."))
+        if validos:
+            with self.almacenamiento.lote(self):
+                for isbn, id_usuario in validos:
+                    self._prestar(isbn, id_usuario, dias, indexar=False)
+                self._reindexar({isbn for isbn, _ in validos})
+        return resultados
 
-    def cargar_datos(self):
-        try:
-            with open("libros.json", "r", encoding="utf-8") as f:
-                for libro_data in json.load(f):
-                    libro = Libro(**libro_data)
-                    self.libros[libro.isbn] = libro
-            with open("usuarios.json", "r", encoding="utf-8") as f:
-                for usuario_data in json.load(f):
-                    usuario = Usuario(usuario_data["nombre"], usuario_data["id_usuario"])
-                    for ldata in usuario_data.get("libros_prestados", []):
-                        usuario.libros_prestados.append(Libro(**ldata))
-                    for ldata in usuario_data.get("historial", []):
-                        usuario.historial.append(Libro(**ldata))
-                    self.usuarios_ids.add(usuario.id_usuario)
-                    self.usuarios[usuario.id_usuario] = usuario
-            with open("prestamos.json", "r", encoding="utf-8") as f:
-                self.prestamos = json.load(f)
+    def devolver_lote(self, devoluciones: List[Tuple[str, str]]) -> List[Dict]:
+        resultados, validos, vistos = [], [], set()
+        for isbn, id_usuario in devoluciones:
+            clave = (isbn, id_usuario)
+            usuario = self.usuarios.get(id_usuario)
+            if usuario is None:
+                resultados.append(self._resultado(clave, False, "No hay usuario con ese ID."))
+            elif clave in vistos or isbn not in usuario.libros_prestados:
+                resultados.append(self._resultado(clave, False, f"{usuario.nombre} no tiene ese libro."))
+            else:
+                vistos.add(clave)
+                validos.append((isbn, usuario))
+                resultados.append(self._resultado(clave, True, "Libro devuelto."))
+        if validos:
+            with self.almacenamiento.lote(self):
+                for isbn, usuario in validos:
+                    self._devolver(isbn, usuario, indexar=False)
+                self._reindexar({isbn for isbn, _ in validos})
+        return resultados
+
+    # Búsquedas (no distinguen mayúsculas ni tildes; opcionalmente incluyen prestados)
+    def _buscar(self, campo: str, texto: str, incluir_prestados: bool):
+        # Con SQLite la búsqueda es una consulta preparada sobre las columnas indexadas
+        isbns = self.almacenamiento.buscar_libros(campo, texto, incluir_prestados)
+        if isbns is not None:
+            return [self.catalogo[isbn] for isbn in isbns]
+        resultados = self.indice_disponibles.buscar(campo, texto)
+        if incluir_prestados:
+            # Un título con copias libres y prestadas está en los dos índices
+            vistos = {libro.isbn for libro in resultados}
+            resultados.extend(libro for libro in self.indice_prestados.buscar(campo, texto)
+                              if libro.isbn not in vistos)
+        return resultados
+
+    def buscar_por_titulo(self, titulo: str, incluir_prestados: bool = False):
+        return self._buscar("titulo", titulo, incluir_prestados)
+
+    def buscar_por_autor(self, autor: str, incluir_prestados: bool = False):
+        return self._buscar("autor", autor, incluir_prestados)
+
+    def buscar_por_categoria(self, categoria: str, incluir_prestados: bool = False):
+        return self._buscar("categoria", categoria, incluir_prestados)
+
+    def buscar_texto(self, consulta: str, limite: int = 10):
+        """Libros disponibles más relevantes para la consulta (título y autor, BM25)."""
+        return [self.libros[isbn] for isbn, _ in self.motor_busqueda.buscar(consulta, limite)]
+
+    # Recomendaciones a partir de los historiales
+    def recomendar(self, isbn: str, k: int = 5) -> List[Tuple[Libro, int]]:
+        return [(self.catalogo[otro], lectores) for otro, lectores in self.recomendador.recomendar(isbn, k)]
+
+    # Vencimientos
+    def programar_prestamos(self):
+        """Reconstruye la agenda desde los préstamos (a los antiguos sin fecha se les asigna una)."""
+        self.agenda = AgendaVencimientos()
+        ahora = datetime.now().replace(microsecond=0)
+        for prestamo in self.prestamos:
+            if "fecha_vencimiento" not in prestamo:
+                prestamo["fecha_prestamo"] = ahora.isoformat()
+                prestamo["fecha_vencimiento"] = (ahora + timedelta(days=DIAS_PRESTAMO)).isoformat()
+            vencimiento = datetime.fromisoformat(prestamo["fecha_vencimiento"]).timestamp()
+            self.agenda.programar(prestamo["id_usuario"], prestamo["libro"]["isbn"], vencimiento)
+
+    def prestamos_vencidos(self, n: int = 10) -> List[Dict]:
+        return [self.prestamos.obtener(id_usuario, isbn) for id_usuario, isbn, _ in self.agenda.vencidos(n)]
+
+    def prestamos_por_vencer(self, horas: float = 24) -> List[Dict]:
+        return [self.prestamos.obtener(id_usuario, isbn)
+                for id_usuario, isbn, _ in self.agenda.por_vencer(horas * 3600)]
+
+    # Persistencia según el almacenamiento configurado
+    def iniciar(self):
+        self.almacenamiento.cargar(self)
+
+    def finalizar(self):
+        self.almacenamiento.guardar(self)
+        self.almacenamiento.cerrar()
+
+    # Guardado y carga de datos en archivos JSON separados (también importación/exportación)
+    def guardar_datos(self, silencioso: bool = False):
+        escribir_json("libros.json", [libro.to_dict() for libro in self.libros.values()], indent=4)
+        escribir_json("usuarios.json", [usuario.to_dict() for usuario in self.usuarios.values()], indent=4)
+        # Libros que no están en libros.json (prestados o solo en historiales)
+        escribir_json("catalogo.json", [libro.to_dict() for isbn, libro in self.catalogo.items()
+                                        if isbn not in self.libros], indent=4)
+        escribir_json("prestamos.json", self.prestamos.to_list(), indent=4)
+        escribir_json("existencias.json", self.existencias.to_list(), indent=4)
+        self.motor_busqueda.guardar("indice_busqueda.json")
+        if not silencioso:
+            print("Datos guardados correctamente en archivos JSON separados.")
+
+    def _en_catalogo(self, isbn: str, faltantes: Set[str]) -> Libro:
+        """Libro del catálogo; si no está (p. ej. falta catalogo.json) se crea uno provisional."""
+        libro = self.catalogo.get(isbn)
+        if libro is None:
+            libro = Libro("Título desconocido", "Autor desconocido", "Sin categoría", isbn)
+            self.catalogo[isbn] = libro
+            faltantes.add(isbn)
+        return libro
+
+    def _internar(self, ref, faltantes: Set[str]) -> Libro:
+        # Una referencia es un ISBN o, en archivos antiguos, el diccionario completo del libro
+        if isinstance(ref, str):
+            return self._en_catalogo(ref, faltantes)
+        libro = self.catalogo.get(ref["isbn"])
+        if libro is None:
+            libro = Libro(**ref)
+            self.catalogo[libro.isbn] = libro
+        return libro
+
+    def _migrar_existencias(self, disponibles: List[Libro]):
+        # Datos anteriores a los ejemplares: cada libro disponible y cada préstamo es una copia
+        for libro in disponibles:
+            self.existencias.añadir(libro.isbn)
+        for prestamo in self.prestamos:
+            isbn = prestamo["libro"]["isbn"]
+            self.existencias.añadir(isbn)
+            prestamo["ejemplar"] = self.existencias.tomar(isbn)
+
+    def _indexar_disponibles(self, faltantes: Optional[Set[str]] = None):
+        faltantes = set() if faltantes is None else faltantes
+        for isbn, libres in self.existencias.libres.items():
+            if libres:
+                libro = self._en_catalogo(isbn, faltantes)
+                self.libros[isbn] = libro
+                self.indice_disponibles.agregar(libro)
+
+    # Archivos JSON que lee cargar_datos, en el orden en que se integran
+    # (los préstamos y usuarios hacen referencia a los libros)
+    ARCHIVOS_DATOS = ("libros.json", "catalogo.json", "prestamos.json", "usuarios.json", "existencias.json")
+
+    def cargar_datos(self, usar_procesos: bool = False):
+        """Carga los archivos JSON a la vez (hilos o, con usar_procesos, procesos).
+
+        Cada archivo se trata por separado: si falta o está dañado se informa y se
+        siguen cargando los demás. Los elementos se integran a medida que se leen
+        y se muestra cuántos había y cuánto tardó la lectura de cada archivo.
+        """
+        cargados: Set[str] = set()
+        disponibles: List[Libro] = []
+        faltantes: Set[str] = set()
+        self.prestamos = RegistroPrestamos()
+
+        def integrar_libros(libros):
+            for libro in libros:
+                self.catalogo[libro.isbn] = libro
+                disponibles.append(libro)
+
+        def integrar_catalogo(libros):
+            for libro in libros:
+                self.catalogo.setdefault(libro.isbn, libro)
+
+        def integrar_prestamos(prestamos):
+            # Cada préstamo lleva los datos de su libro: sirven si falta catalogo.json
+            for prestamo in prestamos:
+                self._internar(prestamo["libro"], faltantes)
+                self.prestamos.agregar(prestamo)
+
+        def integrar_usuarios(usuarios):
+            for usuario_data in usuarios:
+                usuario = Usuario(usuario_data["nombre"], usuario_data["id_usuario"], self.catalogo)
+                for ref in usuario_data.get("libros_prestados", []):
+                    libro = self._internar(ref, faltantes)
+                    usuario.libros_prestados.append(libro.isbn)
+                    self.indice_prestados.agregar(libro)
+                for ref in usuario_data.get("historial", []):
+                    usuario.historial.append(self._internar(ref, faltantes).isbn)
+                self.usuarios_ids.add(usuario.id_usuario)
+                self.usuarios[usuario.id_usuario] = usuario
+
+        def integrar_existencias(copias):
+            for copia in copias:
+                self.existencias.cargar(copia["ejemplar"], copia["isbn"], copia["disponible"])
+
+        integrar = dict(zip(self.ARCHIVOS_DATOS, (integrar_libros, integrar_catalogo, integrar_prestamos,
+                                                  integrar_usuarios, integrar_existencias)))
+        with contextlib.ExitStack() as pila:
+            hilos = pila.enter_context(ThreadPoolExecutor(max_workers=len(self.ARCHIVOS_DATOS)))
+            procesos = (pila.enter_context(ProcessPoolExecutor(max_workers=len(self.ARCHIVOS_DATOS)))
+                        if usar_procesos else None)
+            lectores = [LectorJSON(ruta, ruta in ("libros.json", "catalogo.json"), hilos, procesos)
+                        for ruta in self.ARCHIVOS_DATOS]
+            for lector in lectores:
+                # Al salir se vacían las colas: un lector abandonado por un error quedaría esperando
+                pila.callback(lector.descartar)
+            for lector in lectores:
+                try:
+                    integrar[lector.ruta](lector)
+                    cargados.add(lector.ruta)
+                    print(f"  {lector.ruta}: {lector.leidos} elemento(s) en {lector.segundos:.3f} s")
+                except FileNotFoundError:
+                    print(f"  {lector.ruta}: no encontrado.")
+                except (OSError, ValueError, TypeError, KeyError) as e:
+                    # Lo integrado antes del error se conserva
+                    print(f"  {lector.ruta}: error al leer tras {lector.leidos} elemento(s) ({e}).")
+
+        # Datos anteriores a los ejemplares (o existencias.json ilegible desde el principio)
+        if "existencias.json" not in cargados and not len(self.existencias):
+            self._migrar_existencias(disponibles)
+        self._indexar_disponibles(faltantes)
+        if faltantes:
+            print(f"  {len(faltantes)} libro(s) sin datos en el catálogo se cargaron como "
+                  f"\"Título desconocido\": {', '.join(sorted(faltantes))}")
+        self.motor_busqueda = MotorBusqueda.cargar("indice_busqueda.json", self.libros)
+        self.programar_prestamos()
+        self.recomendador = Recomendador.desde_usuarios(self.usuarios.values())
+        if cargados:
             print("Datos cargados correctamente desde archivos JSON separados.")
-        except FileNotFoundError:
+        else:
             print("No se encontraron archivos de datos. Se crearán nuevos.")
 
 # -----------------------------
@@ -205,8 +1469,11 @@ def cargar_usuarios_ejemplo(biblioteca: Biblioteca):
 # Menú interactivo
 # -----------------------------
 def menu():
-    biblioteca = Biblioteca()
-    biblioteca.cargar_datos()
+    if ALMACENAMIENTO == "sqlite":
+        biblioteca = Biblioteca(AlmacenamientoSQLite(ARCHIVO_SQLITE))
+    else:
+        biblioteca = Biblioteca()
+    biblioteca.iniciar()
     if not biblioteca.libros:
         cargar_libros_ejemplo(biblioteca)
     if not biblioteca.usuarios:
@@ -215,7 +1482,7 @@ def menu():
     while True:
         print("\n--- Biblioteca General ---")
         print("1. Añadir libro")
-        print("2. Quitar libro")
+        print("2. Quitar ejemplar de un libro")
         print("3. Registrar usuario")
         print("4. Dar de baja usuario")
         print("5. Prestar libro")
@@ -229,6 +1496,11 @@ def menu():
         print("13. Listar todos los libros disponibles")
         print("14. Listar todos los libros prestados")
         print("15. Listar todos los libros agregados en general")
+        print("16. Buscar libro por texto (título o autor)")
+        print("17. Exportar datos a archivos JSON")
+        print("18. Ver préstamos vencidos")
+        print("19. Ver préstamos que vencen en las próximas 24 horas")
+        print("20. Ver recomendaciones para un libro")
         print("0. Salir")
 
         opcion = input("Elige una opción: ")
@@ -239,13 +1511,14 @@ def menu():
             categoria = input("Categoría: ")
             isbn = input("ISBN: ")
             try:
+                ejemplares = int(input("Número de ejemplares [1]: ") or 1)
                 libro = Libro(titulo, autor, categoria, isbn)
-                biblioteca.añadir_libro(libro)
+                biblioteca.añadir_libro(libro, ejemplares)
             except ValueError as e:
                 print(e)
 
         elif opcion == "2":
-            isbn = input("ISBN del libro a quitar: ")
+            isbn = input("ISBN del libro (se retira un ejemplar disponible): ")
             biblioteca.quitar_libro(isbn)
 
         elif opcion == "3":
@@ -315,8 +1588,8 @@ def menu():
 
         elif opcion == "13":
             print("Libros disponibles:")
-            for libro in biblioteca.libros.values():
-                print(f"- {libro}")
+            for isbn, libro in biblioteca.libros.items():
+                print(f"- {libro} [{biblioteca.existencias.disponibles(isbn)} ejemplar(es)]")
 
         elif opcion == "14":
             print("Todos los libros prestados:")
@@ -329,15 +1602,49 @@ def menu():
 
         elif opcion == "15":
             print("Todos los libros agregados en general (historial completo):")
-            agregados = list(biblioteca.libros.values())
-            for p in biblioteca.prestamos:
-                libro = p["libro"]
-                agregados.append(Libro(libro["titulo"], libro["autor"], libro["categoria"], libro["isbn"]))
-            for libro in agregados:
-                print(f"- {libro}")
+            existencias = biblioteca.existencias
+            for isbn in existencias.ejemplares:
+                print(f"- {biblioteca.catalogo[isbn]} "
+                      f"[{existencias.disponibles(isbn)} de {existencias.total(isbn)} disponibles]")
 
-        elif opcion == "0":
+        elif opcion == "16":
+            consulta = input("Texto a buscar: ")
+            resultados = biblioteca.buscar_texto(consulta)
+            for libro in resultados:
+                print(libro)
+            if not resultados:
+                print("No se encontró ningún libro.")
+
+        elif opcion == "17":
             biblioteca.guardar_datos()
+
+        elif opcion == "18":
+            vencidos = biblioteca.prestamos_vencidos()
+            if not vencidos:
+                print("No hay préstamos vencidos.")
+            for p in vencidos:
+                print(f"- {p['libro']['titulo']} (Prestado a {p['nombre_usuario']}, venció el {p['fecha_vencimiento']})")
+
+        elif opcion == "19":
+            proximos = biblioteca.prestamos_por_vencer()
+            if not proximos:
+                print("No hay préstamos que venzan en las próximas 24 horas.")
+            for p in proximos:
+                print(f"- {p['libro']['titulo']} (Prestado a {p['nombre_usuario']}, vence el {p['fecha_vencimiento']})")
+
+        elif opcion == "20":
+            isbn = input("ISBN del libro: ")
+            if isbn not in biblioteca.catalogo:
+                print("No hay libro con ese ISBN.")
+            else:
+                recomendaciones = biblioteca.recomendar(isbn)
+                if not recomendaciones:
+                    print("Todavía no hay lectores de este libro que hayan leído otros.")
+                for libro, lectores in recomendaciones:
+                    print(f"- {libro} ({lectores} lector(es) en común)")
+
+        elif opcion == "0":
+            biblioteca.finalizar()
             print("Saliendo...")
             break
 
@@ -0,0 +1,105 @@
+# -------------------------------
+# Benchmark del motor de búsqueda (MotorBusqueda) con hasta 1M libros
+# -------------------------------
+# Construye el índice con títulos y autores sintéticos (palabras con
+# frecuencias tipo Zipf, como en un catálogo real) y mide la latencia media de:
+#   - exacta: una palabra, sin expandir como prefijo
+#   - prefijo: las 3 primeras letras, como al escribir (se expande a los términos del vocabulario)
+#   - BM25: consultas de 2 y 3 palabras, la última también como prefijo
+# También mide construir el índice, guardarlo y volver a cargarlo.
+#
+# Uso: python benchmark_busqueda.py   (con 1M libros usa ~1 GB de memoria)
+import importlib.util
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+
+RUTA_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Sistema de Gestión de Biblioteca Digital.py")
+TAMANOS = (100_000, 1_000_000)
+CONSULTAS = 200
+
+SILABAS = ("ba", "be", "ca", "co", "da", "de", "dra", "fa", "ga", "la", "le", "li", "lo", "ma", "me", "mi",
+           "na", "no", "pa", "pe", "ra", "re", "ri", "ro", "sa", "se", "ta", "te", "to", "va", "ve", "za")
+
+
+def cargar_app():
+    spec = importlib.util.spec_from_file_location("biblioteca_digital", RUTA_APP)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def crear_palabras(azar, cantidad):
+    palabras = set()
+    while len(palabras) < cantidad:
+        palabras.add("".join(azar.choice(SILABAS) for _ in range(azar.randint(2, 4))))
+    return sorted(palabras)
+
+
+def crear_libros(app, cantidad):
+    azar = random.Random(cantidad)
+    palabras = crear_palabras(azar, 30_000)
+    apellidos = crear_palabras(azar, 5_000)
+    # Pesos 1/rango: pocas palabras muy comunes y una cola larga de raras
+    acumulados = list(itertools.accumulate(1 / (i + 1) for i in range(len(palabras))))
+    libros = []
+    for i in range(cantidad):
+        titulo = " ".join(azar.choices(palabras, cum_weights=acumulados, k=azar.randint(2, 6))).capitalize()
+        autor = f"{azar.choice(apellidos).capitalize()} {azar.choice(apellidos).capitalize()}"
+        libros.append(app.Libro(titulo, autor, "Novela", f"{i:010d}"))
+    return libros, palabras
+
+
+def medir_consultas(motor, consultas, prefijo):
+    inicio = time.perf_counter()
+    for consulta in consultas:
+        motor.buscar(consulta, limite=10, prefijo=prefijo)
+    return (time.perf_counter() - inicio) / len(consultas) * 1000
+
+
+def medir(app, cantidad):
+    libros, palabras = crear_libros(app, cantidad)
+    azar = random.Random(1)
+
+    inicio = time.perf_counter()
+    motor = app.MotorBusqueda()
+    motor.agregar_lote(libros)
+    construir = time.perf_counter() - inicio
+
+    comunes, raras = palabras[:300], palabras[-3000:]
+    exactas = [azar.choice(raras if i % 2 else comunes) for i in range(CONSULTAS)]
+    prefijos = [azar.choice(palabras)[:3] for _ in range(CONSULTAS)]
+    varias = [" ".join(azar.choice(palabras) for _ in range(2 + i % 2)) for i in range(CONSULTAS)]
+    resultados = {
+        "exacta": medir_consultas(motor, exactas, prefijo=False),
+        "prefijo": medir_consultas(motor, prefijos, prefijo=True),
+        "BM25": medir_consultas(motor, varias, prefijo=True),
+    }
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "indice_busqueda.json")
+        inicio = time.perf_counter()
+        motor.guardar(ruta)
+        guardar = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        cargado = app.MotorBusqueda.cargar(ruta, {libro.isbn: libro for libro in libros})
+        cargar = time.perf_counter() - inicio
+    assert cargado.buscar(varias[0]) == motor.buscar(varias[0])
+    return construir, guardar, cargar, resultados
+
+
+def main():
+    app = cargar_app()
+    for cantidad in TAMANOS:
+        construir, guardar, cargar, resultados = medir(app, cantidad)
+        print(f"{cantidad} libros: construir {construir:.1f} s, guardar {guardar:.1f} s, cargar {cargar:.1f} s")
+        for nombre, ms in resultados.items():
+            print(f"  {nombre:>8}: {ms:.3f} ms por consulta")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# -------------------------------
+# Benchmark del Recomendador con 100k usuarios y 1M de préstamos
+# -------------------------------
+# Historiales sintéticos: 100k usuarios, 50k títulos con popularidad tipo Zipf
+# (unos pocos libros muy leídos y una cola larga) y 1M de préstamos en total.
+# Mide:
+#   - construir la matriz desde los historiales (como al cargar los datos)
+#   - registrar: actualización incremental por préstamo nuevo
+#   - recomendar: top 5 de un título popular y de uno cualquiera, sin caché
+#     (justo después de invalidarla) y con caché
+#   - quitar_usuario: dar de baja a un usuario con su historial
+#
+# Uso: python benchmark_recomendador.py   (usa ~300 MB de memoria)
+import importlib.util
+import itertools
+import os
+import random
+import sys
+import time
+
+RUTA_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Sistema de Gestión de Biblioteca Digital.py")
+USUARIOS = 100_000
+TITULOS = 50_000
+PRESTAMOS = 1_000_000
+REPETICIONES = 1_000
+
+
+def cargar_app():
+    spec = importlib.util.spec_from_file_location("biblioteca_digital", RUTA_APP)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def crear_usuarios(app, azar):
+    isbns = [f"{i:010d}" for i in range(TITULOS)]
+    acumulados = list(itertools.accumulate(1 / (i + 1) for i in range(TITULOS)))
+    usuarios = [app.Usuario(f"Usuario {i}", f"U{i}") for i in range(USUARIOS)]
+    for isbn in azar.choices(isbns, cum_weights=acumulados, k=PRESTAMOS):
+        azar.choice(usuarios).historial.append(isbn)
+    return usuarios, isbns
+
+
+def us(segundos, cantidad):
+    return segundos / cantidad * 1e6
+
+
+def medir_recomendar(recomendador, isbns):
+    """µs por top 5 sin caché y con caché para la lista de ISBN dada."""
+    sin_cache = 0.0
+    for isbn in isbns:
+        recomendador._cache.pop(isbn, None)  # lo mismo que hace un préstamo que toca su fila
+        inicio = time.perf_counter()
+        recomendador.recomendar(isbn, 5)
+        sin_cache += time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    for isbn in isbns:
+        recomendador.recomendar(isbn, 5)
+    con_cache = time.perf_counter() - inicio
+    return us(sin_cache, len(isbns)), us(con_cache, len(isbns))
+
+
+def main():
+    app = cargar_app()
+    azar = random.Random(20)
+    usuarios, isbns = crear_usuarios(app, azar)
+
+    inicio = time.perf_counter()
+    recomendador = app.Recomendador.desde_usuarios(usuarios)
+    construir = time.perf_counter() - inicio
+    entradas = sum(len(fila) for fila in recomendador.coocurrencias.values())
+    print(f"{USUARIOS} usuarios, {TITULOS} títulos, {PRESTAMOS} préstamos")
+    print(f"  construir:      {construir:.1f} s ({entradas} coocurrencias distintas de cero)")
+
+    nuevos = [(f"U{azar.randrange(USUARIOS)}", azar.choice(isbns)) for _ in range(REPETICIONES)]
+    inicio = time.perf_counter()
+    for id_usuario, isbn in nuevos:
+        recomendador.registrar(id_usuario, isbn)
+    print(f"  registrar:      {us(time.perf_counter() - inicio, REPETICIONES):.1f} µs por préstamo")
+
+    for nombre, muestra in (("popular", isbns[:10]), ("cualquiera", azar.sample(isbns, REPETICIONES))):
+        sin_cache, con_cache = medir_recomendar(recomendador, muestra)
+        print(f"  top 5 {nombre + ':':<11} {sin_cache:.1f} µs sin caché, {con_cache:.2f} µs con caché")
+
+    bajas = [f"U{i}" for i in azar.sample(range(USUARIOS), REPETICIONES)]
+    inicio = time.perf_counter()
+    for id_usuario in bajas:
+        recomendador.quitar_usuario(id_usuario)
+    print(f"  quitar_usuario: {us(time.perf_counter() - inicio, REPETICIONES):.1f} µs por usuario")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# -------------------------------
+# Benchmark de AgendaVencimientos con 1M de préstamos activos
+# -------------------------------
+# Programa 1M de préstamos con vencimientos repartidos en los próximos 30 días
+# (y una parte ya vencidos) y mide:
+#   - programar: alta de un préstamo en la agenda
+#   - vencidos / por vencer: los 10 vencidos más antiguos y los que vencen en
+#     las próximas 24 h (hasta 100), con el reloj quieto
+#   - avanzar: el reloj avanza una hora y los préstamos de esa hora pasan de
+#     la cola de pendientes a la de vencidos (costo por préstamo movido)
+#   - devolver: cancelar un préstamo (borrado perezoso), incluyendo las
+#     compactaciones que dispara cuando dominan las entradas viejas
+#   - las mismas consultas después de devolver la mitad
+#
+# Uso: python benchmark_vencimientos.py
+import importlib.util
+import os
+import random
+import sys
+import time
+
+RUTA_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Sistema de Gestión de Biblioteca Digital.py")
+PRESTAMOS = 1_000_000
+CONSULTAS = 1_000
+DIA = 24 * 3600
+
+
+def cargar_app():
+    spec = importlib.util.spec_from_file_location("biblioteca_digital", RUTA_APP)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def us(segundos, cantidad):
+    return segundos / cantidad * 1e6
+
+
+def medir_consultas(agenda, ahora):
+    """µs por consulta de vencidos y de por_vencer en el instante `ahora`."""
+    agenda.vencidos(10, ahora=ahora)
+    inicio = time.perf_counter()
+    for _ in range(CONSULTAS):
+        agenda.vencidos(10, ahora=ahora)
+    vencidos = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    for _ in range(CONSULTAS):
+        agenda.por_vencer(DIA, ahora=ahora)
+    por_vencer = time.perf_counter() - inicio
+    return us(vencidos, CONSULTAS), us(por_vencer, CONSULTAS)
+
+
+def imprimir_consultas(agenda, ahora):
+    vencidos, por_vencer = medir_consultas(agenda, ahora)
+    print(f"  vencidos:    {vencidos:.2f} µs por consulta (top 10)")
+    print(f"  por vencer:  {por_vencer:.2f} µs por consulta (24 h, hasta 100)")
+
+
+def main():
+    app = cargar_app()
+    azar = random.Random(17)
+    ahora = 1_700_000_000.0
+    # Un 10 % ya vencidos, el resto a lo largo de 30 días
+    prestamos = [(f"U{i % 100_000}", f"{i:010d}", ahora + azar.uniform(-3 * DIA, 30 * DIA))
+                 for i in range(PRESTAMOS)]
+
+    agenda = app.AgendaVencimientos()
+    inicio = time.perf_counter()
+    for id_usuario, isbn, vencimiento in prestamos:
+        agenda.programar(id_usuario, isbn, vencimiento)
+    programar = time.perf_counter() - inicio
+    print(f"{PRESTAMOS} préstamos activos")
+    print(f"  programar:   {us(programar, PRESTAMOS):.2f} µs por préstamo ({programar:.1f} s en total)")
+
+    # La primera consulta pasa a la cola de vencidos todo lo que ya venció
+    inicio = time.perf_counter()
+    agenda.vencidos(10, ahora=ahora)
+    print(f"  1.ª consulta: {(time.perf_counter() - inicio) * 1000:.1f} ms (mueve los ya vencidos)")
+    imprimir_consultas(agenda, ahora)
+
+    horas = 48
+    movidos = sum(ahora <= vencimiento < ahora + horas * 3600 for _, _, vencimiento in prestamos)
+    inicio = time.perf_counter()
+    for hora in range(1, horas + 1):
+        agenda.vencidos(10, ahora=ahora + hora * 3600)
+    avanzar = time.perf_counter() - inicio
+    print(f"  avanzar:     {us(avanzar, movidos):.2f} µs por préstamo que vence ({movidos} en {horas} h)")
+    ahora += horas * 3600
+
+    devueltos = azar.sample(prestamos, PRESTAMOS // 2)
+    inicio = time.perf_counter()
+    for id_usuario, isbn, _ in devueltos:
+        agenda.cancelar(id_usuario, isbn)
+    devolver = time.perf_counter() - inicio
+    print(f"  devolver:    {us(devolver, len(devueltos)):.2f} µs por devolución "
+          f"(la mitad, {devolver:.1f} s en total con las compactaciones)")
+
+    print(f"Tras devolver la mitad ({len(agenda)} activos)")
+    imprimir_consultas(agenda, ahora)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+# -----------------------------
+# Pruebas de Biblioteca (python -m unittest o pytest, desde esta carpeta)
+# -----------------------------
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+RUTA_MODULO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Sistema de Gestión de Biblioteca Digital.py")
+spec = importlib.util.spec_from_file_location("biblioteca_digital", RUTA_MODULO)
+bd = importlib.util.module_from_spec(spec)
+# Registrado para que los procesos de cargar_datos(usar_procesos=True) puedan importarlo
+sys.modules[spec.name] = bd
+spec.loader.exec_module(bd)
+
+
+class PruebaConArchivos(unittest.TestCase):
+    """Cada prueba trabaja en una carpeta temporal (los JSON usan rutas relativas)."""
+
+    def setUp(self):
+        self._carpeta = tempfile.TemporaryDirectory()
+        self._anterior = os.getcwd()
+        os.chdir(self._carpeta.name)
+
+    def tearDown(self):
+        os.chdir(self._anterior)
+        self._carpeta.cleanup()
+
+    @staticmethod
+    def silencio():
+        return contextlib.redirect_stdout(io.StringIO())
+
+    def biblioteca_con_prestamos(self):
+        biblioteca = bd.Biblioteca()
+        with self.silencio():
+            biblioteca.añadir_libro(bd.Libro("Dune", "Frank Herbert", "Ciencia ficción", "1111111111"))
+            biblioteca.añadir_libro(bd.Libro("Emma", "Jane Austen", "Novela", "2222222222"), ejemplares=2)
+            biblioteca.registrar_usuario(bd.Usuario("Ana", "U1"))
+            biblioteca.prestar_libro("1111111111", "U1")
+            biblioteca.prestar_libro("2222222222", "U1")
+            biblioteca.guardar_datos()
+        return biblioteca
+
+    def recargar(self):
+        biblioteca = bd.Biblioteca()
+        salida = io.StringIO()
+        with contextlib.redirect_stdout(salida):
+            biblioteca.cargar_datos()
+        return biblioteca, salida.getvalue()
+
+
+class PruebaCargaSinCatalogo(PruebaConArchivos):
+    def test_sin_catalogo_recupera_los_libros_de_los_prestamos(self):
+        self.biblioteca_con_prestamos()
+        os.remove("catalogo.json")
+
+        biblioteca, salida = self.recargar()
+
+        self.assertIn("catalogo.json: no encontrado.", salida)
+        self.assertEqual(str(biblioteca.catalogo["1111111111"]),
+                         "Dune por Frank Herbert (Ciencia ficción, ISBN: 1111111111)")
+        self.assertEqual(biblioteca.usuarios["U1"].libros_prestados, ["1111111111", "2222222222"])
+        self.assertEqual(len(biblioteca.prestamos), 2)
+        self.assertEqual(biblioteca.existencias.prestados("1111111111"), 1)
+        # Emma conserva su ejemplar libre
+        self.assertIn("2222222222", biblioteca.libros)
+        self.assertNotIn("Título desconocido", salida)
+
+    def test_referencias_sin_datos_usan_un_libro_provisional(self):
+        self.biblioteca_con_prestamos()
+        for ruta in ("catalogo.json", "libros.json", "prestamos.json"):
+            os.remove(ruta)
+
+        biblioteca, salida = self.recargar()
+
+        self.assertIn("2 libro(s) sin datos en el catálogo", salida)
+        self.assertEqual(biblioteca.catalogo["1111111111"].info[0], "Título desconocido")
+        self.assertEqual(biblioteca.usuarios["U1"].libros_prestados, ["1111111111", "2222222222"])
+        # La copia libre de existencias.json sigue disponible aunque falten los datos del libro
+        self.assertIn("2222222222", biblioteca.libros)
+        self.assertEqual(biblioteca.buscar_por_titulo("Título desconocido"), [biblioteca.catalogo["2222222222"]])
+
+    def test_un_archivo_ilegible_no_impide_cargar_los_demas(self):
+        self.biblioteca_con_prestamos()
+        # Un directorio con el nombre del archivo: open falla con un OSError que no es FileNotFoundError
+        os.remove("catalogo.json")
+        os.mkdir("catalogo.json")
+
+        for usar_procesos in (False, True):
+            biblioteca = bd.Biblioteca()
+            salida = io.StringIO()
+            with contextlib.redirect_stdout(salida):
+                biblioteca.cargar_datos(usar_procesos=usar_procesos)
+
+            self.assertIn("catalogo.json: error al leer", salida.getvalue())
+            self.assertEqual(biblioteca.usuarios["U1"].libros_prestados, ["1111111111", "2222222222"])
+            self.assertEqual(str(biblioteca.catalogo["1111111111"]),
+                             "Dune por Frank Herbert (Ciencia ficción, ISBN: 1111111111)")
+
+
+class PruebaLotes(PruebaConArchivos):
+    LIBROS = [
+        {"titulo": "Dune", "autor": "Frank Herbert", "categoria": "Ciencia ficción", "isbn": "1111111111", "ejemplares": 2},
+        {"titulo": "Emma", "autor": "Jane Austen", "categoria": "Novela", "isbn": "2222222222"},
+        {"titulo": "Ulises", "autor": "James Joyce", "categoria": "Novela", "isbn": "3333333333"},
+    ]
+    PRESTAMOS = [("1111111111", "U1"), ("1111111111", "U2"), ("2222222222", "U1"), ("3333333333", "U2")]
+    DEVOLUCIONES = [("1111111111", "U1"), ("2222222222", "U1")]
+
+    @staticmethod
+    def estado_indices(biblioteca):
+        def claves(indice):
+            return {campo: {k: sorted(v) for k, v in valores.items()} for campo, valores in indice.indices.items()}
+        return (claves(biblioteca.indice_disponibles), claves(biblioteca.indice_prestados),
+                biblioteca.motor_busqueda.postings, sorted(biblioteca.motor_busqueda.vocabulario))
+
+    def test_lotes_no_imprimen_y_dejan_los_mismos_indices(self):
+        por_lotes = bd.Biblioteca()
+        salida = io.StringIO()
+        with contextlib.redirect_stdout(salida):
+            por_lotes.añadir_libros(self.LIBROS)
+            por_lotes.registrar_usuarios([bd.Usuario("Ana", "U1"), bd.Usuario("Luis", "U2")])
+            por_lotes.prestar_lote(self.PRESTAMOS)
+            por_lotes.devolver_lote(self.DEVOLUCIONES)
+        self.assertEqual(salida.getvalue(), "")
+
+        uno_a_uno = bd.Biblioteca()
+        with self.silencio():
+            for datos in self.LIBROS:
+                uno_a_uno.añadir_libro(bd.Libro(datos["titulo"], datos["autor"], datos["categoria"], datos["isbn"]),
+                                       datos.get("ejemplares", 1))
+            uno_a_uno.registrar_usuario(bd.Usuario("Ana", "U1"))
+            uno_a_uno.registrar_usuario(bd.Usuario("Luis", "U2"))
+            for isbn, id_usuario in self.PRESTAMOS:
+                uno_a_uno.prestar_libro(isbn, id_usuario)
+            for isbn, id_usuario in self.DEVOLUCIONES:
+                uno_a_uno.devolver_libro(isbn, id_usuario)
+
+        self.assertEqual(self.estado_indices(por_lotes), self.estado_indices(uno_a_uno))
+        self.assertEqual(sorted(por_lotes.libros), ["1111111111", "2222222222"])
+
+
+class PruebaEjemplares(PruebaConArchivos):
+    def test_busqueda_con_prestados_no_repite_titulos(self):
+        biblioteca = bd.Biblioteca()
+        with self.silencio():
+            biblioteca.añadir_libro(bd.Libro("Dune", "Frank Herbert", "Ciencia ficción", "1111111111"), ejemplares=2)
+            biblioteca.registrar_usuario(bd.Usuario("Ana", "U1"))
+            biblioteca.prestar_libro("1111111111", "U1")
+
+        encontrados = biblioteca.buscar_por_titulo("Dune", incluir_prestados=True)
+
+        self.assertEqual([libro.isbn for libro in encontrados], ["1111111111"])
+
+    def comprobar_baja_devuelve_ejemplares(self, biblioteca):
+        with self.silencio():
+            biblioteca.añadir_libro(bd.Libro("Dune", "Frank Herbert", "Ciencia ficción", "1111111111"))
+            biblioteca.registrar_usuario(bd.Usuario("Ana", "U1"))
+            biblioteca.prestar_libro("1111111111", "U1")
+            biblioteca.dar_baja_usuario("U1")
+
+        self.assertEqual(biblioteca.existencias.prestados("1111111111"), 0)
+        self.assertEqual(len(biblioteca.prestamos), 0)
+        self.assertIn("1111111111", biblioteca.libros)
+        self.assertEqual(biblioteca.buscar_por_titulo("Dune", incluir_prestados=True), [biblioteca.catalogo["1111111111"]])
+        self.assertEqual(biblioteca.indice_prestados.buscar("titulo", "Dune"), [])
+        self.assertEqual(biblioteca.prestamos_por_vencer(horas=24 * 365), [])
+
+    def test_dar_de_baja_devuelve_sus_ejemplares(self):
+        self.comprobar_baja_devuelve_ejemplares(bd.Biblioteca())
+
+    def test_dar_de_baja_devuelve_sus_ejemplares_en_sqlite(self):
+        almacenamiento = bd.AlmacenamientoSQLite("biblioteca.db")
+        biblioteca = bd.Biblioteca(almacenamiento)
+        try:
+            self.comprobar_baja_devuelve_ejemplares(biblioteca)
+            filas = almacenamiento.conexion.execute("SELECT disponible FROM ejemplares").fetchall()
+            self.assertEqual(filas, [(1,)])
+            self.assertEqual(almacenamiento.buscar_libros("titulo", "Dune"), ["1111111111"])
+        finally:
+            almacenamiento.cerrar()
+
+
+class PruebaBusquedaSQLite(PruebaConArchivos):
+    def test_busca_en_la_base_con_los_mismos_resultados(self):
+        almacenamiento = bd.AlmacenamientoSQLite("biblioteca.db")
+        en_sqlite, en_memoria = bd.Biblioteca(almacenamiento), bd.Biblioteca()
+        try:
+            for biblioteca in (en_sqlite, en_memoria):
+                with self.silencio():
+                    biblioteca.añadir_libro(bd.Libro("Cien años de soledad", "Gabriel García Márquez",
+                                                     "Novela", "1111111111"))
+                    biblioteca.añadir_libro(bd.Libro("Dune", "Frank Herbert", "Ciencia ficción", "2222222222"))
+                    biblioteca.registrar_usuario(bd.Usuario("Ana", "U1"))
+                    biblioteca.prestar_libro("2222222222", "U1")
+
+            llamadas = []
+            buscar_libros = almacenamiento.buscar_libros
+            almacenamiento.buscar_libros = lambda *args: llamadas.append(args) or buscar_libros(*args)
+            for campo, texto, incluir_prestados in [("autor", "gabriel garcia marquez", False),
+                                                    ("titulo", "DUNE", False),
+                                                    ("titulo", "DUNE", True),
+                                                    ("categoria", "novela", True)]:
+                buscar = getattr(bd.Biblioteca, f"buscar_por_{campo}")
+                self.assertEqual([libro.isbn for libro in buscar(en_sqlite, texto, incluir_prestados)],
+                                 [libro.isbn for libro in buscar(en_memoria, texto, incluir_prestados)])
+            self.assertEqual(len(llamadas), 4)
+        finally:
+            almacenamiento.cerrar()
+
+
+class PruebaAgendaVencimientos(unittest.TestCase):
+    def test_volver_a_prestar_en_el_mismo_segundo_no_duplica(self):
+        agenda = bd.AgendaVencimientos()
+        agenda.programar("U1", "1111111111", 100.0)
+        agenda.cancelar("U1", "1111111111")
+        agenda.programar("U1", "1111111111", 100.0)
+
+        self.assertEqual(agenda.por_vencer(200.0, ahora=0.0), [("U1", "1111111111", 100.0)])
+        self.assertEqual(agenda.vencidos(ahora=200.0), [("U1", "1111111111", 100.0)])
+
+    def test_los_devueltos_no_aparecen(self):
+        agenda = bd.AgendaVencimientos()
+        agenda.programar("U1", "1111111111", 100.0)
+        agenda.programar("U2", "1111111111", 50.0)
+        agenda.cancelar("U2", "1111111111")
+
+        self.assertEqual(agenda.vencidos(ahora=200.0), [("U1", "1111111111", 100.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
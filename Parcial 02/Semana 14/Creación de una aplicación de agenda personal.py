@@ -3,12 +3,19 @@ from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
 import json
 import os
+import sys
 from datetime import datetime, timedelta
+
+# Módulo compartido de la carpeta Parcial 02 (guardado_diferido.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from guardado_diferido import GuardadoDiferido
+
 # -------------------------------
 # Archivo JSON donde se guardarán los eventos
 # -------------------------------
 ARCHIVO_JSON = "eventos.json"
 
+
 # -------------------------------
 # Ventana principal
 # -------------------------------
@@ -49,9 +56,13 @@ def cargar_eventos():
 
 
 def guardar_eventos():
-    """Guarda los eventos en un archivo JSON"""
-    with open(ARCHIVO_JSON, "w", encoding="utf-8") as f:
-        json.dump(eventos, f, ensure_ascii=False, indent=4)
+    """Programa el guardado de los eventos en el archivo JSON (en segundo plano)"""
+    guardado.programar()
+
+
+def avisar_error_guardado(error):
+    """Avisa si el hilo de guardado no pudo escribir el archivo"""
+    messagebox.showerror("Error al guardar", f"No se pudieron guardar los cambios en {ARCHIVO_JSON}:\n{error}")
 
 
 def ordenar_eventos():
@@ -171,10 +182,17 @@ def editar_evento():
 
 
 def salir():
-    """Cerrar la aplicación"""
+    """Cerrar la aplicación sin perder cambios pendientes"""
+    guardado.vaciar()
     app.quit()
 
 
+def cerrar_ventana():
+    """Cerrar con la X de la ventana sin perder cambios pendientes"""
+    guardado.vaciar()
+    app.destroy()
+
+
 # -------------------------------
 # Frames para organizar interfaz
 # -------------------------------
@@ -230,6 +248,12 @@ tk.Button(frame_botones, text="Eliminar Seleccionado", command=eliminar_evento,
 tk.Button(frame_botones, text="Salir", command=salir,
           bg="gray", fg="white", font=("Courier", 12)).pack(side=tk.RIGHT, padx=5)
 
+# -------------------------------
+# Guardado en segundo plano y cierre con la X
+# -------------------------------
+guardado = GuardadoDiferido(app, ARCHIVO_JSON, lambda: [dict(ev) for ev in eventos], avisar_error_guardado)
+app.protocol("WM_DELETE_WINDOW", cerrar_ventana)
+
 # -------------------------------
 # Cargar eventos previos al iniciar
 # -------------------------------
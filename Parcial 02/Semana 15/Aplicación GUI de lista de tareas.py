@@ -3,8 +3,14 @@ from tkinter import messagebox, ttk
 from tkcalendar import DateEntry
 import json
 import os
+import sys
 from datetime import datetime
 
+# Módulos compartidos de la carpeta Parcial 02 (guardado_diferido.py y lista_tareas.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from guardado_diferido import GuardadoDiferido
+from lista_tareas import IndiceTareas, VistaTareas
+
 # -------------------------------
 # Archivo JSON
 # -------------------------------
@@ -36,10 +42,17 @@ def cargar_tareas():
             "descripcion": "Evaluación S.O"
         }
         guardar_tareas()
+    indice.cargar(tareas)
 
 def guardar_tareas():
-    with open(ARCHIVO_JSON, "w", encoding="utf-8") as f:
-        json.dump(tareas, f, ensure_ascii=False, indent=4)
+    # Solo programa la escritura: el hilo de guardado agrupa los cambios seguidos
+    guardado.programar()
+
+def copiar_tareas():
+    return {tid: dict(tarea) for tid, tarea in tareas.items()}
+
+def avisar_error_guardado(error):
+    messagebox.showerror("Error al guardar", f"No se pudieron guardar los cambios en {ARCHIVO_JSON}:\n{error}")
 
 # -------------------------------
 # Funciones de lógica
@@ -51,17 +64,14 @@ def actualizar_contador():
     lbl_contador.config(text=f"📊 Total: {total}   ⏳ Pendientes: {pendientes}   ✔ Completadas: {completadas}")
     app.title(f"GUI Lista de Tareas Vero - Total: {total} | Pendientes: {pendientes} | Completadas: {completadas}")
 
+def fila_tarea(tarea):
+    estado = "✔ Completada" if tarea.get("completada", False) else "⏳ Pendiente"
+    descripcion = tarea.get("descripcion", "")
+    return (tarea.get("texto",""), tarea.get("fecha",""), tarea.get("hora",""), descripcion, estado)
+
 def mostrar_tareas():
-    for item in tree.get_children():
-        tree.delete(item)
-    tareas_ordenadas = sorted(
-        tareas.items(),
-        key=lambda item: datetime.strptime(item[1]["fecha"] + " " + item[1]["hora"], "%d/%m/%Y %H:%M")
-    )
-    for tid, tarea in tareas_ordenadas:
-        estado = "✔ Completada" if tarea.get("completada", False) else "⏳ Pendiente"
-        descripcion = tarea.get("descripcion", "")
-        tree.insert("", tk.END, iid=tid, values=(tarea.get("texto",""), tarea.get("fecha",""), tarea.get("hora",""), descripcion, estado))
+    # El índice ya está ordenado y solo las filas visibles se crean en el Treeview
+    vista.mostrar()
     actualizar_contador()
 
 def generar_id():
@@ -123,11 +133,13 @@ def ventana_tarea(nueva=True, tid=None):
         if nueva:
             new_id = generar_id()
             tareas[new_id] = {"texto": texto, "completada": False, "fecha": fecha, "hora": hora, "descripcion": desc}
+            indice.agregar(new_id, tareas[new_id])
         else:
             tareas[tid]["texto"] = texto
             tareas[tid]["fecha"] = fecha
             tareas[tid]["hora"] = hora
             tareas[tid]["descripcion"] = desc
+            indice.actualizar(tid, tareas[tid])
         guardar_tareas()
         mostrar_tareas()
         ventana.destroy()
@@ -141,17 +153,15 @@ def agregar_tarea():
     ventana_tarea(nueva=True)
 
 def editar_tarea():
-    seleccion = tree.selection()
-    if not seleccion:
+    tid = vista.seleccion
+    if tid is None:
         messagebox.showinfo("Sin selección", "Selecciona una tarea para editar.")
         return
-    tid = seleccion[0]
     ventana_tarea(nueva=False, tid=tid)
 
 def marcar_completada():
-    seleccion = tree.selection()
-    if seleccion:
-        tid = seleccion[0]
+    tid = vista.seleccion
+    if tid is not None:
         tareas[tid]["completada"] = not tareas[tid].get("completada", False)
         guardar_tareas()
         mostrar_tareas()
@@ -159,19 +169,24 @@ def marcar_completada():
         messagebox.showinfo("Sin selección", "Selecciona una tarea para marcar.")
 
 def eliminar_tarea():
-    seleccion = tree.selection()
-    if seleccion:
-        tid = seleccion[0]
+    tid = vista.seleccion
+    if tid is not None:
         if messagebox.askyesno("Confirmar", f"¿Eliminar la tarea {tid}?"):
             tareas.pop(tid)
+            indice.quitar(tid)
             guardar_tareas()
             mostrar_tareas()
     else:
         messagebox.showinfo("Sin selección", "Selecciona una tarea para eliminar.")
 
 def salir():
+    guardado.vaciar()
     app.quit()
 
+def cerrar_ventana():
+    guardado.vaciar()
+    app.destroy()
+
 # -------------------------------
 # Ventana principal
 # -------------------------------
@@ -179,6 +194,8 @@ app = tk.Tk()
 app.geometry("850x500")
 app.configure(bg="black")
 app.title("Gestor de tareas Vero")
+app.protocol("WM_DELETE_WINDOW", cerrar_ventana)
+guardado = GuardadoDiferido(app, ARCHIVO_JSON, copiar_tareas, avisar_error_guardado)
 
 # Botones superiores
 frame_botones = tk.Frame(app, bg="black")
@@ -190,13 +207,19 @@ tk.Button(frame_botones, text="Marcar Completada", command=marcar_completada, bg
 tk.Button(frame_botones, text="Eliminar Tarea", command=eliminar_tarea, bg="red", fg="white", font=("Courier", 12)).pack(side=tk.LEFT, padx=5)
 tk.Button(frame_botones, text="Salir", command=salir, bg="gray", fg="white", font=("Courier", 12)).pack(side=tk.RIGHT, padx=5)
 
-# Treeview para mostrar tareas
+# Treeview para mostrar tareas (con barra de desplazamiento de la lista virtual)
+frame_lista = tk.Frame(app, bg="black")
+frame_lista.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 columns = ("Tarea", "Fecha", "Hora", "Descripción", "Estado")
-tree = ttk.Treeview(app, columns=columns, show="headings", height=15)
+tree = ttk.Treeview(frame_lista, columns=columns, show="headings", height=15)
 for col in columns:
     tree.heading(col, text=col)
     tree.column(col, width=150, anchor="center")
-tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+barra = ttk.Scrollbar(frame_lista, orient=tk.VERTICAL)
+barra.pack(side=tk.RIGHT, fill=tk.Y)
+tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+indice = IndiceTareas()
+vista = VistaTareas(tree, barra, indice, lambda tid: fila_tarea(tareas[tid]))
 
 # Contador de tareas
 lbl_contador = tk.Label(app, text="📊 Total: 0   ⏳ Pendientes: 0   ✔ Completadas: 0",
@@ -3,9 +3,15 @@ from tkinter import messagebox, ttk
 from tkcalendar import DateEntry
 import json
 import os
+import sys
 from datetime import datetime
 import winsound
 
+# Módulos compartidos de la carpeta Parcial 02 (guardado_diferido.py y lista_tareas.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from guardado_diferido import GuardadoDiferido
+from lista_tareas import IndiceTareas, VistaTareas
+
 # -------------------------------
 # Archivo JSON
 # -------------------------------
@@ -18,8 +24,13 @@ class GestorTareas:
         self.root.geometry("900x550")
         self.root.title("🎵 GUI de Tareas Vero")
 
-        # Diccionario de tareas
+        # Diccionario de tareas y sus ids ordenados por fecha y hora
         self.tareas = {}
+        self.indice = IndiceTareas()
+
+        # Los cambios se escriben en segundo plano; al cerrar se guarda lo pendiente
+        self.guardado = GuardadoDiferido(self.root, ARCHIVO_JSON, self.copiar_tareas, self.avisar_error_guardado)
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar_ventana)
 
         # -------------------------------
         # Triple fondo celeste
@@ -58,12 +69,20 @@ class GestorTareas:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=150, anchor="center")
         self.tree.place(x=10, y=70)
+        barra = ttk.Scrollbar(self.canvas_fondo, orient=tk.VERTICAL)
+        barra.place(in_=self.tree, relx=1.0, y=0, relheight=1.0, bordermode="outside")
+        # Solo las filas visibles están en el Treeview; la vista recorre todas las tareas
+        self.vista = VistaTareas(self.tree, barra, self.indice, lambda tid: self.fila_tarea(self.tareas[tid]))
 
         # Selección con clic
         self.tree.bind("<ButtonRelease-1>", self.seleccionar_tarea)
-        # Selección con teclado (arriba/abajo)
+        # Selección con teclado (arriba/abajo, página arriba/abajo, inicio/fin)
         self.tree.bind("<Up>", self.seleccionar_arriba)
         self.tree.bind("<Down>", self.seleccionar_abajo)
+        self.tree.bind("<Prior>", self.seleccionar_pagina_arriba)
+        self.tree.bind("<Next>", self.seleccionar_pagina_abajo)
+        self.tree.bind("<Home>", self.seleccionar_primera)
+        self.tree.bind("<End>", self.seleccionar_ultima)
 
         # -------------------------------
         # Contador
@@ -95,10 +114,8 @@ class GestorTareas:
 
         # Dar foco al Treeview para usar teclado desde el inicio
         self.tree.focus_set()
-        items = self.tree.get_children()
-        if items:
-            self.tree.selection_set(items[0])
-            self.tree.focus(items[0])
+        if self.indice.iids:
+            self.vista.seleccionar(0)
 
     # -------------------------------
     # Selección de tarea
@@ -106,24 +123,33 @@ class GestorTareas:
     def seleccionar_tarea(self, event):
         item = self.tree.identify_row(event.y)
         if item:
-            self.tree.selection_set(item)
+            self.vista.elegir(item)
 
+    # La vista guarda la posición de la selección: moverse no recorre el Treeview
     def seleccionar_arriba(self, event):
-        seleccion = self.tree.selection()
-        items = self.tree.get_children()
-        if seleccion:
-            idx = items.index(seleccion[0])
-            if idx > 0:
-                self.tree.selection_set(items[idx-1])
+        self.vista.mover_seleccion(-1)
         return "break"
 
     def seleccionar_abajo(self, event):
-        seleccion = self.tree.selection()
-        items = self.tree.get_children()
-        if seleccion:
-            idx = items.index(seleccion[0])
-            if idx < len(items)-1:
-                self.tree.selection_set(items[idx+1])
+        self.vista.mover_seleccion(1)
+        return "break"
+
+    def seleccionar_pagina_arriba(self, event):
+        self.vista.mover_seleccion(-self.vista.visibles)
+        return "break"
+
+    def seleccionar_pagina_abajo(self, event):
+        self.vista.mover_seleccion(self.vista.visibles)
+        return "break"
+
+    def seleccionar_primera(self, event):
+        if self.indice.iids:
+            self.vista.seleccionar(0)
+        return "break"
+
+    def seleccionar_ultima(self, event):
+        if self.indice.iids:
+            self.vista.seleccionar(len(self.indice.iids) - 1)
         return "break"
 
     # -------------------------------
@@ -158,10 +184,17 @@ class GestorTareas:
                 "descripcion": "Evaluación S.O"
             }
             self.guardar_tareas()
+        self.indice.cargar(self.tareas)
 
     def guardar_tareas(self):
-        with open(ARCHIVO_JSON, "w", encoding="utf-8") as f:
-            json.dump(self.tareas, f, ensure_ascii=False, indent=4)
+        # Solo programa la escritura: el hilo de guardado agrupa los cambios seguidos
+        self.guardado.programar()
+
+    def copiar_tareas(self):
+        return {tid: dict(tarea) for tid, tarea in self.tareas.items()}
+
+    def avisar_error_guardado(self, error):
+        messagebox.showerror("Error al guardar", f"No se pudieron guardar los cambios en {ARCHIVO_JSON}:\n{error}")
 
     # -------------------------------
     # Utilidades
@@ -174,29 +207,18 @@ class GestorTareas:
             text=f"📊 Total: {total}   ⏳ Pendientes: {pendientes}   ✔ Completadas: {completadas}")
         self.root.title(f"🎵 Gestor de Tareas Vero - Total: {total} | Pendientes: {pendientes} | Completadas: {completadas}")
 
-    def mostrar_tareas(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+    @staticmethod
+    def fila_tarea(tarea):
+        estado = "✔ Completada" if tarea.get("completada", False) else "⏳ Pendiente"
+        return (tarea.get("texto", ""), tarea.get("fecha", ""),
+                tarea.get("hora", ""), tarea.get("descripcion", ""), estado)
 
-        tareas_ordenadas = sorted(
-            self.tareas.items(),
-            key=lambda item: datetime.strptime(
-                item[1]["fecha"] + " " + item[1]["hora"], "%d/%m/%Y %H:%M")
-        )
-
-        for tid, tarea in tareas_ordenadas:
-            estado = "✔ Completada" if tarea.get("completada", False) else "⏳ Pendiente"
-            self.tree.insert("", tk.END, iid=tid,
-                             values=(tarea.get("texto", ""), tarea.get("fecha", ""),
-                                     tarea.get("hora", ""), tarea.get("descripcion", ""), estado))
+    def mostrar_tareas(self):
+        # self.indice ya está ordenado: no se convierten fechas ni se ordena nada,
+        # y la vista solo crea o cambia las filas visibles que son distintas
+        self.vista.mostrar()
         self.actualizar_contador()
 
-        # Seleccionar la primera tarea automáticamente
-        items = self.tree.get_children()
-        if items:
-            self.tree.selection_set(items[0])
-            self.tree.focus(items[0])
-
     def generar_id(self):
         if self.tareas:
             return str(max(map(int, self.tareas.keys())) + 1)
@@ -257,11 +279,13 @@ class GestorTareas:
             if nueva:
                 new_id = self.generar_id()
                 self.tareas[new_id] = {"texto": texto, "completada": False, "fecha": fecha, "hora": hora, "descripcion": desc}
+                self.indice.agregar(new_id, self.tareas[new_id])
             else:
                 self.tareas[tid]["texto"] = texto
                 self.tareas[tid]["fecha"] = fecha
                 self.tareas[tid]["hora"] = hora
                 self.tareas[tid]["descripcion"] = desc
+                self.indice.actualizar(tid, self.tareas[tid])
 
             self.guardar_tareas()
             self.mostrar_tareas()
@@ -277,17 +301,15 @@ class GestorTareas:
         self.ventana_tarea(nueva=True)
 
     def editar_tarea(self):
-        seleccion = self.tree.selection()
-        if not seleccion:
+        tid = self.vista.seleccion
+        if tid is None:
             messagebox.showinfo("Sin selección", "Selecciona una tarea para editar.")
             return
-        tid = seleccion[0]
         self.ventana_tarea(nueva=False, tid=tid)
 
     def marcar_completada(self):
-        seleccion = self.tree.selection()
-        if seleccion:
-            tid = seleccion[0]
+        tid = self.vista.seleccion
+        if tid is not None:
             self.tareas[tid]["completada"] = not self.tareas[tid].get("completada", False)
             self.guardar_tareas()
             self.mostrar_tareas()
@@ -295,11 +317,11 @@ class GestorTareas:
             messagebox.showinfo("Sin selección", "Selecciona una tarea para marcar.")
 
     def eliminar_tarea(self):
-        seleccion = self.tree.selection()
-        if seleccion:
-            tid = seleccion[0]
+        tid = self.vista.seleccion
+        if tid is not None:
             if messagebox.askyesno("Confirmar", f"¿Eliminar la tarea {tid}?"):
                 self.tareas.pop(tid)
+                self.indice.quitar(tid)
                 self.guardar_tareas()
                 self.mostrar_tareas()
         else:
@@ -315,6 +337,7 @@ class GestorTareas:
         )
         if respuesta:  # Sí
             self.melodia_despedida()
+            self.guardado.vaciar()
             messagebox.showinfo("Salir", "Sistema cerrado. ¡Muchas gracias por utilizar el sistema 🚀😊😎")
             self.root.quit()
         else:  # No → Ventana con X
@@ -325,6 +348,11 @@ class GestorTareas:
             # Cierra automáticamente después de 1.5 segundos
             ventana_no.after(1500, ventana_no.destroy)
 
+    def cerrar_ventana(self):
+        # Cerrar con la X no pide confirmación, pero tampoco pierde cambios
+        self.guardado.vaciar()
+        self.root.destroy()
+
 
 # -------------------------------
 # Ejecutar app
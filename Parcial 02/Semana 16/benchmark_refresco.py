@@ -0,0 +1,163 @@
+# -------------------------------
+# Benchmark del refresco de la lista de tareas (IndiceTareas + VistaTareas)
+# -------------------------------
+# Mide cuánto tarda mostrar_tareas con 10k y 100k tareas:
+#   - antes: cada refresco convertía fecha + hora con strptime y ordenaba todo
+#   - ahora: el IndiceTareas ya está ordenado y la vista solo toca las filas visibles
+# El Treeview se reemplaza por uno en memoria con las mismas operaciones, así se
+# mide el trabajo de Python sin depender de una pantalla; el costo propio de Tk
+# es el de las pocas filas de la ventana, igual en los dos casos.
+#
+# Uso: python benchmark_refresco.py   (necesita lo mismo que la aplicación)
+import importlib.util
+import os
+import random
+import time
+from datetime import datetime
+
+RUTA_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Gestión de Tareas con Atajos de Teclado.py")
+TAMANOS = (10_000, 100_000)
+REPETICIONES = 20
+
+
+class TreeviewEnMemoria:
+    """Lo mínimo de ttk.Treeview que usa VistaTareas, sin ventana."""
+
+    def __init__(self, alto=15):
+        self.alto = alto
+        self.hijos = []
+        self.valores = {}
+        self.elegidos = ()
+
+    def cget(self, opcion):
+        return str(self.alto)
+
+    def config(self, **opciones):
+        pass
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def after_idle(self, funcion):
+        pass
+
+    def insert(self, padre, indice, iid, values):
+        self.hijos.insert(indice, iid)
+        self.valores[iid] = values
+
+    def move(self, iid, padre, indice):
+        if iid in self.valores and iid in self.hijos:
+            self.hijos.remove(iid)
+        self.hijos.insert(indice, iid)
+
+    def detach(self, *iids):
+        for iid in iids:
+            self.hijos.remove(iid)
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.hijos.remove(iid)
+            del self.valores[iid]
+
+    def item(self, iid, values):
+        self.valores[iid] = values
+
+    def selection(self):
+        return self.elegidos
+
+    def selection_set(self, iid):
+        self.elegidos = (iid,)
+
+    def focus(self, iid=None):
+        pass
+
+    def yview_moveto(self, fraccion):
+        pass
+
+    def yview_scroll(self, cantidad, unidad):
+        pass
+
+
+class BarraEnMemoria:
+    def config(self, **opciones):
+        pass
+
+    def set(self, primero, ultimo):
+        pass
+
+
+def cargar_app():
+    spec = importlib.util.spec_from_file_location("gestion_tareas", RUTA_APP)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def crear_tareas(cantidad):
+    azar = random.Random(cantidad)
+    return {
+        str(i): {
+            "texto": f"Tarea {i}",
+            "completada": azar.random() < 0.5,
+            "fecha": f"{azar.randint(1, 28):02d}/{azar.randint(1, 12):02d}/{azar.randint(2024, 2026)}",
+            "hora": f"{azar.randint(0, 23):02d}:{azar.randint(0, 59):02d}",
+            "descripcion": "x" * 20,
+        }
+        for i in range(1, cantidad + 1)
+    }
+
+
+def ms(segundos):
+    return segundos / REPETICIONES * 1000
+
+
+def medir(app, cantidad):
+    tareas = crear_tareas(cantidad)
+
+    inicio = time.perf_counter()
+    indice = app.IndiceTareas()
+    indice.cargar(tareas)
+    carga = time.perf_counter() - inicio
+
+    vista = app.VistaTareas(TreeviewEnMemoria(), BarraEnMemoria(), indice,
+                            lambda tid: app.GestorTareas.fila_tarea(tareas[tid]))
+    vista.mostrar()
+    vista.seleccionar(cantidad // 2)
+    tid = vista.seleccion
+
+    # Antes: cada refresco volvía a convertir y ordenar todas las tareas
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        tareas[tid]["completada"] = not tareas[tid]["completada"]
+        sorted(tareas, key=lambda t: datetime.strptime(tareas[t]["fecha"] + " " + tareas[t]["hora"], "%d/%m/%Y %H:%M"))
+        vista.mostrar()
+    antes = time.perf_counter() - inicio
+
+    # Ahora: marcar una tarea y refrescar
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        tareas[tid]["completada"] = not tareas[tid]["completada"]
+        vista.mostrar()
+    ahora = time.perf_counter() - inicio
+
+    # Ahora: cambiar la fecha de una tarea (se reubica en el índice) y refrescar
+    inicio = time.perf_counter()
+    for i in range(REPETICIONES):
+        tareas[tid]["fecha"] = f"{1 + i % 28:02d}/06/2025"
+        indice.actualizar(tid, tareas[tid])
+        vista.mostrar()
+    edicion = time.perf_counter() - inicio
+
+    return carga * 1000, ms(antes), ms(ahora), ms(edicion)
+
+
+def main():
+    app = cargar_app()
+    print(f"{'tareas':>8} {'cargar índice':>14} {'antes':>10} {'ahora':>10} {'editar fecha':>13}   (ms)")
+    for cantidad in TAMANOS:
+        carga, antes, ahora, edicion = medir(app, cantidad)
+        print(f"{cantidad:>8} {carga:>14.1f} {antes:>10.2f} {ahora:>10.3f} {edicion:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -34,46 +34,46 @@ class Producto:
         return f"ID: {self._id} | Nombre: {self._nombre} | Cantidad: {self._cantidad} | Precio: ${self._precio:.2f}"
 
 
-# Clase representa el inventario (una lista de productos)
+# Clase representa el inventario (diccionario de productos indexado por ID;
+# conserva el orden de inserción para el listado)
 class Inventario:
     def __init__(self):
-        self.productos = []
+        self.productos = {}
 
     # Agrega un producto si el ID no está repetido
     def agregar_producto(self, producto):
-        if any(p.get_id() == producto.get_id() for p in self.productos):
+        if producto.get_id() in self.productos:
             print(f"Error: El ID '{producto.get_id()}' ya existe.")
             return False
-        self.productos.append(producto)
+        self.productos[producto.get_id()] = producto
         print(f"Producto '{producto.get_nombre()}' agregado exitosamente.")
         return True
 
     # Elimina un producto por ID
     def eliminar_producto(self, id_producto):
-        for i, p in enumerate(self.productos):
-            if p.get_id() == id_producto:
-                del self.productos[i]
-                print(f"Producto con ID '{id_producto}' eliminado.")
-                return True
+        if id_producto in self.productos:
+            del self.productos[id_producto]
+            print(f"Producto con ID '{id_producto}' eliminado.")
+            return True
         print(f"No se encontró producto con ID '{id_producto}'.")
         return False
 
     # Actualiza cantidad y/o precio de un producto por ID
     def actualizar_producto(self, id_producto, cantidad=None, precio=None):
-        for p in self.productos:
-            if p.get_id() == id_producto:
-                if cantidad is not None:
-                    p.set_cantidad(cantidad)
-                if precio is not None:
-                    p.set_precio(precio)
-                print(f"Producto con ID '{id_producto}' actualizado.")
-                return True
+        p = self.productos.get(id_producto)
+        if p is not None:
+            if cantidad is not None:
+                p.set_cantidad(cantidad)
+            if precio is not None:
+                p.set_precio(precio)
+            print(f"Producto con ID '{id_producto}' actualizado.")
+            return True
         print(f"No se encontró producto con ID '{id_producto}'.")
         return False
 
     # Busca productos por nombre (coincidencia parcial)
     def buscar_producto_por_nombre(self, nombre):
-        resultados = [p for p in self.productos if nombre.lower() in p.get_nombre().lower()]
+        resultados = [p for p in self.productos.values() if nombre.lower() in p.get_nombre().lower()]
         return resultados
 
     # Muestra todos los productos del inventario
@@ -82,7 +82,7 @@ class Inventario:
             print("El inventario está vacío.")
             return
         print("Listado completo de productos:")
-        for p in self.productos:
+        for p in self.productos.values():
             print(p)
 
 
@@ -0,0 +1,105 @@
+# -------------------------------
+# Guardado en segundo plano (compartido por las aplicaciones de Tk de Parcial 02)
+# -------------------------------
+# Lo usan la agenda de Semana 14 (también la copia de la carpeta Semana 14 de
+# la raíz) y las listas de tareas de Semana 15 y Semana 16. Cada aplicación
+# agrega la carpeta Parcial 02 a sys.path antes de importarlo.
+import json
+import os
+import queue
+import threading
+
+
+class GuardadoDiferido:
+    """Escribe un JSON desde un hilo aparte, agrupando los cambios seguidos.
+
+    Cada cambio solo (re)inicia una espera de ESPERA_MS en el hilo de Tk. Al
+    vencer se copian los datos y el hilo escritor los serializa y reemplaza el
+    archivo de forma atómica, así que una ráfaga de ediciones es una sola
+    escritura y la ventana no se congela. Los errores vuelven al hilo de Tk con
+    after(), y vaciar() escribe lo pendiente antes de cerrar.
+    """
+
+    ESPERA_MS = 400    # cambios más seguidos que esto se guardan juntos
+    REVISION_MS = 100  # cada cuánto mira Tk si el hilo ya terminó
+
+    def __init__(self, root, ruta, copiar, al_fallar):
+        self.root = root
+        self.ruta = ruta
+        self.copiar = copiar        # devuelve una copia de los datos (en el hilo de Tk)
+        self.al_fallar = al_fallar  # recibe el error (en el hilo de Tk)
+        self._espera = None         # after() de la espera en curso
+        self._revision = None       # after() que recoge los resultados
+        self._pendientes = 0        # copias enviadas al hilo sin resultado aún
+        self._copias = queue.Queue()
+        self._resultados = queue.Queue()
+        threading.Thread(target=self._escribir_en_fondo, daemon=True).start()
+
+    def programar(self):
+        if self._espera is not None:
+            self.root.after_cancel(self._espera)
+        self._espera = self.root.after(self.ESPERA_MS, self._enviar)
+
+    def _enviar(self):
+        self._espera = None
+        self._pendientes += 1
+        self._copias.put(self.copiar())
+        if self._revision is None:
+            self._revision = self.root.after(self.REVISION_MS, self._revisar)
+
+    def _revisar(self):
+        self._revision = None
+        self._recoger()
+        if self._pendientes:
+            self._revision = self.root.after(self.REVISION_MS, self._revisar)
+
+    def _recoger(self):
+        while not self._resultados.empty():
+            copias, error = self._resultados.get()
+            self._pendientes -= copias
+            if error is not None:
+                self.al_fallar(error)
+
+    def vaciar(self):
+        """Escribe ya lo que quede pendiente y espera a que el hilo termine."""
+        if self._espera is not None:
+            self.root.after_cancel(self._espera)
+            self._espera = None
+            self._pendientes += 1
+            self._copias.put(self.copiar())
+        self._copias.join()
+        self._recoger()
+
+    def _escribir_en_fondo(self):
+        while True:
+            datos = self._copias.get()
+            copias = 1
+            # Si se juntaron varias copias, basta con escribir la última
+            while not self._copias.empty():
+                datos = self._copias.get()
+                copias += 1
+            error = None
+            try:
+                self._escribir(datos)
+            except Exception as e:
+                error = e
+            finally:
+                # Siempre se responde: si no, vaciar() esperaría para siempre en join()
+                self._resultados.put((copias, error))
+                for _ in range(copias):
+                    self._copias.task_done()
+
+    def _escribir(self, datos):
+        # Se escribe en un temporal y se reemplaza el original de una vez:
+        # si algo falla a mitad, el archivo anterior queda intacto
+        temporal = self.ruta + ".tmp"
+        try:
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump(datos, f, ensure_ascii=False, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporal, self.ruta)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
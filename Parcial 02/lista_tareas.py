@@ -0,0 +1,296 @@
+# -------------------------------
+# Índice ordenado y lista virtual de tareas (compartidos por Semana 15 y Semana 16)
+# -------------------------------
+# Cada aplicación agrega la carpeta Parcial 02 a sys.path antes de importarlo.
+import bisect
+from datetime import datetime
+
+
+class IndiceTareas:
+    """Ids de las tareas ordenados por fecha y hora.
+
+    La fecha y hora de cada tarea se convierten una sola vez, al cargarla o al
+    editarla, y las altas, cambios y bajas mantienen el orden con bisect, así
+    que mostrar las tareas no vuelve a convertir ni a ordenar nada.
+    """
+
+    def __init__(self):
+        self.claves = []   # (fecha y hora, id numérico), en orden
+        self.iids = []     # ids en el mismo orden que self.claves
+        self.marcas = {}   # id -> su clave ya convertida
+        self.version = 0   # cambia con cada alta, cambio o baja
+
+    @staticmethod
+    def marca(tarea):
+        """Fecha ("dd/mm/aaaa") y hora ("HH:MM") de la tarea, sin pasar por strptime."""
+        dia, mes, anio = tarea["fecha"].split("/")
+        hora, minuto = tarea["hora"].split(":")
+        return datetime(int(anio), int(mes), int(dia), int(hora), int(minuto))
+
+    def cargar(self, tareas):
+        # A igual fecha y hora se ordena por id, el orden en que se crearon
+        self.marcas = {tid: (self.marca(tarea), int(tid)) for tid, tarea in tareas.items()}
+        self.iids = sorted(self.marcas, key=self.marcas.__getitem__)
+        self.claves = [self.marcas[tid] for tid in self.iids]
+        self.version += 1
+
+    def posicion(self, tid):
+        clave = self.marcas.get(tid)
+        if clave is None:
+            return None
+        return bisect.bisect_left(self.claves, clave)
+
+    def agregar(self, tid, tarea):
+        clave = (self.marca(tarea), int(tid))
+        i = bisect.bisect(self.claves, clave)
+        self.claves.insert(i, clave)
+        self.iids.insert(i, tid)
+        self.marcas[tid] = clave
+        self.version += 1
+
+    def quitar(self, tid):
+        i = self.posicion(tid)
+        del self.claves[i]
+        del self.iids[i]
+        del self.marcas[tid]
+        self.version += 1
+
+    def actualizar(self, tid, tarea):
+        self.quitar(tid)
+        self.agregar(tid, tarea)
+
+
+class VistaTareas:
+    """Muestra en el Treeview una lista ordenada de tareas de forma virtual.
+
+    El Treeview solo tiene la ventana de filas visibles más un margen arriba y
+    abajo; la barra de desplazamiento recorre todo el IndiceTareas y
+    la selección se recuerda aunque la tarea quede fuera de la ventana. Al
+    mover la ventana o cambiar los datos solo se tocan las filas distintas.
+    """
+
+    MARGEN = 20  # filas extra por encima y por debajo de las visibles
+
+    def __init__(self, tree, barra, indice, fila):
+        self.tree = tree
+        self.barra = barra
+        self.fila = fila              # función iid -> valores de la fila
+        self.indice = indice          # IndiceTareas con todas las tareas en orden
+        self.primera = 0              # índice de la primera fila visible
+        # Filas que caben; se recalcula si el Treeview cambia de tamaño (p. ej. pack con expand)
+        self.visibles = int(tree.cget("height"))
+        self._alto_fila = 0           # alto de una fila y del encabezado, medidos en pantalla
+        self._encabezado = 0
+        self.seleccion = None         # iid seleccionado, esté o no en la ventana
+        # Posición de la selección y versión del índice en que se calculó: mientras
+        # el índice no cambie, moverse por la lista no vuelve a buscarla
+        self._posicion = 0
+        self._version = -1
+        # Ventana que hay ahora en el Treeview
+        self.inicio = self.fin = 0
+        self.orden = []               # iids de la ventana, en orden
+        self.valores = {}             # iid -> valores mostrados en esa fila
+
+        self.barra.config(command=self.desplazar)
+        self.tree.config(yscrollcommand=self._treeview_desplazado)
+        self.tree.bind("<<TreeviewSelect>>", self._treeview_seleccion, add="+")
+        self.tree.bind("<Configure>", self._treeview_redimensionado, add="+")
+        self.tree.bind("<MouseWheel>", self._rueda)
+        self.tree.bind("<Button-4>", self._rueda)
+        self.tree.bind("<Button-5>", self._rueda)
+
+    # --- Diferencias con el Treeview ---
+    @staticmethod
+    def _subsecuencia_creciente(secuencia):
+        """Posiciones de una subsecuencia creciente más larga (las filas que no hace falta mover)."""
+        finales, posiciones_finales = [], []
+        previa = [-1] * len(secuencia)
+        for i, valor in enumerate(secuencia):
+            k = bisect.bisect_left(finales, valor)
+            if k == len(finales):
+                finales.append(valor)
+                posiciones_finales.append(i)
+            else:
+                finales[k] = valor
+                posiciones_finales[k] = i
+            previa[i] = posiciones_finales[k - 1] if k else -1
+        resultado = set()
+        i = posiciones_finales[-1] if posiciones_finales else -1
+        while i != -1:
+            resultado.add(i)
+            i = previa[i]
+        return resultado
+
+    def _aplicar(self, filas):
+        """Deja en el Treeview exactamente filas (lista ordenada de (iid, valores))."""
+        nuevos = {iid for iid, _ in filas}
+        eliminados = [iid for iid in self.orden if iid not in nuevos]
+        if eliminados:
+            self.tree.delete(*eliminados)
+            for iid in eliminados:
+                del self.valores[iid]
+
+        # Las filas que conservan su orden relativo se quedan; el resto se separa y se recoloca
+        posicion = {iid: i for i, iid in enumerate(self.orden)}
+        existentes = [iid for iid, _ in filas if iid in self.valores]
+        quietas = self._subsecuencia_creciente([posicion[iid] for iid in existentes])
+        fijas = {existentes[i] for i in quietas}
+        movidas = [iid for iid in existentes if iid not in fijas]
+        if movidas:
+            self.tree.detach(*movidas)
+
+        # Antes de cada índice ya están las filas anteriores y, después, las fijas que faltan
+        for indice, (iid, valores) in enumerate(filas):
+            anteriores = self.valores.get(iid)
+            if anteriores is None:
+                self.tree.insert("", indice, iid=iid, values=valores)
+            else:
+                if iid not in fijas:
+                    self.tree.move(iid, "", indice)
+                if anteriores != valores:
+                    self.tree.item(iid, values=valores)
+            self.valores[iid] = valores
+        self.orden = [iid for iid, _ in filas]
+
+    # --- Ventana visible ---
+    def _limitar(self):
+        self.primera = max(0, min(self.primera, len(self.indice.iids) - self.visibles))
+
+    def _cambiar_ventana(self, forzar=False):
+        """Vuelve a llenar la ventana si las filas visibles se acercan a su borde."""
+        total = len(self.indice.iids)
+        mitad = self.MARGEN // 2
+        if (not forzar and self.inicio <= max(0, self.primera - mitad)
+                and min(total, self.primera + self.visibles + mitad) <= self.fin):
+            return False
+        self.inicio = max(0, self.primera - self.MARGEN)
+        self.fin = min(total, self.primera + self.visibles + self.MARGEN)
+        self._aplicar([(iid, self.fila(iid)) for iid in self.indice.iids[self.inicio:self.fin]])
+        return True
+
+    def _actualizar_barra(self):
+        total = len(self.indice.iids)
+        if total:
+            self.barra.set(self.primera / total, min(1.0, (self.primera + self.visibles) / total))
+        else:
+            self.barra.set(0.0, 1.0)
+
+    def _renderizar(self, forzar=False):
+        self._limitar()
+        self._cambiar_ventana(forzar)
+        # Se coloca la primera fila visible arriba del Treeview (desplazamiento en filas enteras)
+        self.tree.yview_moveto(0)
+        self.tree.yview_scroll(self.primera - self.inicio, "units")
+        if self.seleccion in self.valores:
+            if self.tree.selection() != (self.seleccion,):
+                self.tree.selection_set(self.seleccion)
+            self.tree.focus(self.seleccion)
+        self._actualizar_barra()
+
+    def _treeview_desplazado(self, primero, ultimo):
+        # El Treeview también se desplaza solo (clic en una fila cortada, teclas por defecto)
+        n = self.fin - self.inicio
+        if n:
+            self.primera = self.inicio + round(float(primero) * n)
+            self._limitar()
+        if self._cambiar_ventana():
+            self._renderizar()
+        else:
+            self._actualizar_barra()
+
+    def _treeview_redimensionado(self, event):
+        # Se mide después de que Tk acomode las filas con el nuevo tamaño
+        self.tree.after_idle(self._medir)
+
+    def _medir(self):
+        """Ajusta self.visibles a las filas completas que caben en el alto actual del Treeview."""
+        if self.inicio <= self.primera < self.fin:
+            caja = self.tree.bbox(self.indice.iids[self.primera])
+            if caja:
+                self._encabezado, self._alto_fila = caja[1], caja[3]
+        if not self._alto_fila:
+            return
+        visibles = max(1, (self.tree.winfo_height() - self._encabezado) // self._alto_fila)
+        if visibles != self.visibles:
+            self.visibles = visibles
+            self._renderizar()
+
+    def _treeview_seleccion(self, event):
+        # Si la fila seleccionada sale de la ventana, Tk vacía la selección pero la tarea sigue elegida
+        seleccion = self.tree.selection()
+        if seleccion:
+            self._recordar(seleccion[0])
+
+    def _recordar(self, iid):
+        # La posición en caché es de la selección anterior: se vuelve a buscar una vez
+        if iid != self.seleccion:
+            self.seleccion = iid
+            self._version = -1
+            self.indice_seleccion()
+
+    def _rueda(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.desplazar("scroll", -3, "units")
+        else:
+            self.desplazar("scroll", 3, "units")
+        return "break"
+
+    def desplazar(self, accion, cantidad, unidad=None):
+        """Comando de la barra de desplazamiento ("moveto" o "scroll")."""
+        if accion == "moveto":
+            self.primera = int(float(cantidad) * len(self.indice.iids))
+        else:
+            paso = self.visibles if unidad == "pages" else 1
+            self.primera += int(cantidad) * paso
+        self._renderizar()
+
+    # --- Datos y selección ---
+    def mostrar(self):
+        """Vuelve a mostrar el índice; si la tarea seleccionada ya no existe, pasa a la que ocupa su lugar."""
+        iids = self.indice.iids
+        if self.seleccion is not None and self.indice_seleccion() is None:
+            self.seleccion = iids[min(self._posicion, len(iids) - 1)] if iids else None
+        if self.seleccion is not None:
+            self._incluir(self.indice_seleccion())
+        self._renderizar(forzar=True)
+        if not self._alto_fila and iids:
+            # Aún no se pudo medir una fila (lista vacía o sin dibujar)
+            self.tree.after_idle(self._medir)
+
+    def indice_seleccion(self):
+        if self.seleccion is None:
+            return None
+        if self._version == self.indice.version:
+            return self._posicion
+        posicion = self.indice.posicion(self.seleccion)
+        if posicion is not None:
+            self._posicion, self._version = posicion, self.indice.version
+        return posicion
+
+    def _incluir(self, indice):
+        if indice < self.primera:
+            self.primera = indice
+        elif indice >= self.primera + self.visibles:
+            self.primera = indice - self.visibles + 1
+
+    def ver(self, indice):
+        self._incluir(indice)
+        self._renderizar()
+
+    def elegir(self, iid):
+        """Selecciona una fila que ya está en el Treeview (por ejemplo, la del clic)."""
+        self._recordar(iid)
+        self.tree.selection_set(iid)
+
+    def seleccionar(self, indice):
+        self.seleccion = self.indice.iids[indice]
+        self._posicion, self._version = indice, self.indice.version
+        self.ver(indice)
+
+    def mover_seleccion(self, filas):
+        """Mueve la selección filas posiciones (negativo = hacia arriba), sin salir de la lista."""
+        total = len(self.indice.iids)
+        if total:
+            actual = self.indice_seleccion()
+            destino = 0 if actual is None else actual + filas
+            self.seleccionar(max(0, min(destino, total - 1)))